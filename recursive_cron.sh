@@ -4,13 +4,14 @@
 
 set -euo pipefail
 
-mkdir -p /home/xavier/.openclaw/workspace/cohera-repo/chatgpt
-LOG_FILE="/home/xavier/.openclaw/workspace/cohera-repo/chatgpt/recursive_cron.log"
+REPO_ROOT="${COHERA_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)}"
+mkdir -p "$REPO_ROOT/chatgpt"
+LOG_FILE="$REPO_ROOT/chatgpt/recursive_cron.log"
 DATE_STR=$(date +"%d/%m/%Y %H:%M:%S")
 
 {
   echo "[$DATE_STR] Initiating recursive research pipeline..."
-  cd /home/xavier/.openclaw/workspace/cohera-repo
+  cd "$REPO_ROOT"
   COHERA_AUTO_PUSH=1 bash research_pipeline.sh
   echo "[$DATE_STR] Pipeline execution finished."
 } >> "$LOG_FILE" 2>&1
@@ -4,14 +4,23 @@
 
 set -euo pipefail
 
-REPO_ROOT="/home/xavier/.openclaw/workspace/cohera-repo"
+REPO_ROOT="${COHERA_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)}"
+export COHERA_ROOT="$REPO_ROOT"
 
 DATE_STR=$(date +"%d/%m/%Y %H:%M:%S")
+cd "$REPO_ROOT"
+
+echo "=============================================="
+echo "[$DATE_STR] COMPILE PHASE: READY FOR COMPILATION candidates -> PDF"
+echo "=============================================="
+
+# Failed documents are reported and retried once their sources change; they do not block the run.
+python3 scripts/build_latex.py || echo "LaTeX build reported failures; continuing."
+
 echo "=============================================="
 echo "[$DATE_STR] RESEARCH PHASE: discovery + structured notes"
 echo "=============================================="
 
-cd "$REPO_ROOT"
 python3 scripts/recursive_research_pipeline.py
 
 echo "=============================================="
@@ -38,10 +47,18 @@ is_allowed_change() {
     site/index.html|site/research/index.html|site/publications/index.html)
       return 0
       ;;
+    # Archive pages the pipeline rolls old cards into.
+    site/page-*.html|site/research/page-*.html|site/publications/page-*.html)
+      return 0
+      ;;
     site/publications/pdf|site/publications/pdf/|site/publications/pdf/*)
       return 0
       ;;
-    research/pipeline/*|research/sources/*|research/digests/*|research/synthesis-latest.md)
+    # Static search index shards rebuilt by the pipeline.
+    site/search|site/search/|site/search/*)
+      return 0
+      ;;
+    research/pipeline/*|research/sources/*|research/digests/*|research/synthesis-latest.md|research/publications/final/*)
       return 0
       ;;
     *)
@@ -65,8 +82,16 @@ if (( ${#DISALLOWED[@]} > 0 )); then
   exit 1
 fi
 
-if ! git diff --quiet -- site/index.html site/research/index.html site/publications/index.html site/publications/pdf research/pipeline research/sources research/digests research/synthesis-latest.md; then
-  git add site/index.html site/research/index.html site/publications/index.html site/publications/pdf research/pipeline research/sources research/digests research/synthesis-latest.md
+shopt -s nullglob
+PUBLISH_PATHS=(
+  site/index.html site/research/index.html site/publications/index.html
+  site/page-*.html site/research/page-*.html site/publications/page-*.html
+  site/publications/pdf site/search research/pipeline research/sources research/publications/final research/digests research/synthesis-latest.md
+)
+shopt -u nullglob
+
+if [[ -n "$(git status --porcelain -- "${PUBLISH_PATHS[@]}")" ]]; then
+  git add "${PUBLISH_PATHS[@]}"
   git commit -m "Automated research pipeline refresh"
 
   if [[ "${COHERA_AUTO_PUSH:-0}" == "1" ]]; then
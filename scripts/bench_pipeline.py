@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for scripts/recursive_research_pipeline.py.
+
+Builds a synthetic repo checkout in a temp directory (feed history, site
+pages with thousands of cards, publication PDFs), serves generated Atom
+feeds from a local stand-in for export.arxiv.org, and times each pipeline
+stage. Results are written as JSON so runs can be compared across commits:
+
+    python3 scripts/bench_pipeline.py --out bench-before.json
+    python3 scripts/bench_pipeline.py --out bench-after.json --compare bench-before.json
+
+No network access is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import hashlib
+import http.server
+import io
+import json
+import os
+import pathlib
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+SCRIPTS = pathlib.Path(__file__).resolve().parent
+REPO = SCRIPTS.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import recursive_research_pipeline as pipeline  # noqa: E402
+
+WORDS = (
+    "quantum coherence metabolic oscillation lattice entropy network boundary phase field "
+    "topological regeneration decoherence holographic substrate bioelectric pump kinetics "
+    "stochastic model inference thermodynamic chaos control twin uncertainty crystal time"
+).split()
+
+
+def synthetic_item(i: int, rng: random.Random, topic: str) -> dict:
+    day = dt.date(2026, 2, 28) - dt.timedelta(days=i // 40)
+    return {
+        "id": f"http://arxiv.org/abs/{2500 + i // 100000:04d}.{i % 100000:05d}v1",
+        "title": " ".join(rng.choice(WORDS) for _ in range(8)).capitalize(),
+        # Half the words from a long synthetic vocabulary so abstracts are not near-duplicates.
+        "summary": " ".join(rng.choice(WORDS) if rng.random() < 0.5 else f"term{rng.randrange(20000)}" for _ in range(150)),
+        "published": f"{day.isoformat()}T12:00:00Z",
+        "authors": [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+        "pdf": f"http://arxiv.org/pdf/{2500 + i // 100000:04d}.{i % 100000:05d}v1.pdf",
+        "topic": topic,
+        "source": "arXiv",
+    }
+
+
+def atom_feed(items: list[dict]) -> bytes:
+    from xml.sax.saxutils import escape
+
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom"><title>bench</title>']
+    for it in items:
+        authors = "".join(f"<author><name>{escape(a)}</name></author>" for a in it["authors"])
+        parts.append(
+            f"<entry><id>{it['id']}</id><published>{it['published']}</published>"
+            f"<title>{escape(it['title'])}</title><summary>{escape(it['summary'])}</summary>{authors}"
+            f'<link href="{it["id"]}" rel="alternate" type="text/html"/>'
+            f'<link title="pdf" href="{it["pdf"]}" rel="related" type="application/pdf"/></entry>'
+        )
+    parts.append("</feed>")
+    return "".join(parts).encode("utf-8")
+
+
+class FakeArxiv(http.server.ThreadingHTTPServer):
+    """Local stand-in for export.arxiv.org/api/query with fixed per-request latency."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, id_offset: int):
+        super().__init__(("127.0.0.1", 0), _FakeArxivHandler)
+        self.latency = latency
+        self.id_offset = id_offset
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/query"
+
+
+class _FakeArxivHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        server: FakeArxiv = self.server  # type: ignore[assignment]
+        server.requests += 1
+        qs = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        query = qs.get("search_query", [""])[0]
+        start = int(qs.get("start", ["0"])[0])
+        count = int(qs.get("max_results", ["10"])[0])
+        seed = int(hashlib.sha1(query.encode("utf-8")).hexdigest()[:8], 16)
+        rng = random.Random(seed + start)
+        base = server.id_offset + (seed % 997) * 1000
+        body = atom_feed([synthetic_item(base + start + i, rng, query) for i in range(count)])
+        time.sleep(server.latency)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def build_corpus(root: pathlib.Path, args: argparse.Namespace) -> None:
+    """Synthetic checkout: feed history, site pages padded with cards, publication PDFs."""
+    rng = random.Random(1)
+    shutil.copytree(REPO / "site", root / "site", ignore=shutil.ignore_patterns("*.pdf", "*.log"))
+    pipeline.set_root(root)
+    pipeline.ensure_dirs()
+
+    # Legacy feed.json is imported by the first open_feed_store(); keep it a
+    # realistic mix of topics and newest-first like the real file.
+    items = [synthetic_item(i, rng, pipeline.TOPICS[i % len(pipeline.TOPICS)]) for i in range(args.feed_items)]
+    pipeline.STATE_FILE.write_text(json.dumps({"items": items}), encoding="utf-8")
+    pipeline.open_feed_store()
+
+    for page, grid in (("index.html", "grid-1"), ("research/index.html", "grid-2")):
+        cards = [
+            (f"bench:{page}:{i}", pipeline.render_card("01/01/2026", "Bench", f"Card {i}", " ".join(rng.choice(WORDS) for _ in range(60))))
+            for i in range(args.cards)
+        ]
+        path = root / "site" / page
+        data = path.read_text(encoding="utf-8")
+        marker = data.index(f'<div class="grid {grid}">') + len(f'<div class="grid {grid}">')
+        body = "".join(f"\n<!-- PIPELINE:{m} -->\n{b}" for m, b in cards)
+        path.write_text(data[:marker] + body + data[marker:], encoding="utf-8")
+
+    final = root / "research" / "publications" / "final"
+    final.mkdir(parents=True, exist_ok=True)
+    for i in range(args.pdfs):
+        (final / f"Bench_Paper_{i:03d}.pdf").write_bytes(os.urandom(args.pdf_kb * 1024))
+
+
+def timed(results: dict, name: str, fn, *a, **kw):
+    t0 = time.perf_counter()
+    out = fn(*a, **kw)
+    results.setdefault(name, []).append(time.perf_counter() - t0)
+    return out
+
+
+def run_once(args: argparse.Namespace, results: dict, server: FakeArxiv) -> None:
+    with tempfile.TemporaryDirectory(prefix="cohera-bench-") as tmp:
+        root = pathlib.Path(tmp)
+        build_corpus(root, args)
+        pipeline.ARXIV_API_URL = server.url
+        pipeline.TOPICS = [f"bench topic {i}" for i in range(args.topics)]
+        pipeline.MAX_FETCH_PER_TOPIC = args.entries
+        pipeline.ARXIV_POLITE_DELAY_S = 0.0  # local server; batching still shows in httpRequests
+        pipeline.set_root(root)
+
+        discovered, _ = timed(results, "discover_arxiv", pipeline.discover_arxiv, batch=args.batch)
+        timed(results, "discover_arxiv_warm", pipeline.discover_arxiv, batch=args.batch)
+        source_file = timed(results, "write_sources_snapshot", pipeline.write_sources_snapshot, discovered)
+
+        store = timed(results, "open_feed_store", pipeline.open_feed_store)
+        index = timed(results, "open_bm25_index", pipeline.open_bm25_index, store)
+        dedup = timed(results, "open_dedup_index", pipeline.open_dedup_index, store)
+        st = pipeline.load_thread_state()
+        new_items = timed(results, "integrate_new_items", pipeline.integrate_new_items, discovered, store, index, dedup, st)
+        digest_file = timed(results, "write_digest", pipeline.write_digest, new_items, source_file)
+        timed(results, "choose_thread", pipeline.choose_thread, st)
+
+        card = [(f"bench:new:{time.time_ns()}", pipeline.render_card("01/01/2026", "Bench", "New", "x"))]
+        timed(results, "insert_blocks_after_grid_open", pipeline.insert_blocks_after_grid_open, root / "site" / "research" / "index.html", "grid-2", card)
+        timed(results, "append_home_and_research", pipeline.append_home_and_research, new_items, discovered, digest_file, source_file)
+
+        timed(results, "update_search_index", pipeline.update_search_index, store)
+        timed(results, "update_search_index_warm", pipeline.update_search_index, store)
+        timed(results, "sync_publication_pdfs", pipeline.sync_publication_pdfs)
+        timed(results, "sync_publication_pdfs_warm", pipeline.sync_publication_pdfs)
+
+        pipeline.HTTP_CACHE_TTL_S = 0  # full run revalidates every topic
+        with contextlib.redirect_stdout(io.StringIO()):
+            timed(results, "main", pipeline.main, [])
+        pipeline.HTTP_CACHE_TTL_S = float(os.environ.get("COHERA_HTTP_CACHE_TTL", "900"))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict, baseline_file: pathlib.Path) -> None:
+    base = json.loads(baseline_file.read_text(encoding="utf-8"))
+    print(f"\nvs {baseline_file} ({base['meta'].get('commit')}):")
+    for name, cur in current["stages"].items():
+        old = base["stages"].get(name)
+        if not old:
+            print(f"  {name:32s} {cur['median']*1000:10.1f} ms   (new)")
+            continue
+        ratio = cur["median"] / old["median"] if old["median"] else float("inf")
+        print(f"  {name:32s} {cur['median']*1000:10.1f} ms   x{ratio:.2f}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--topics", type=int, default=20, help="topics queried per run")
+    ap.add_argument("--batch", type=int, default=pipeline.DISCOVERY_BATCH_TOPICS, help="topics ORed per arXiv query")
+    ap.add_argument("--entries", type=int, default=50, help="Atom entries per topic response")
+    ap.add_argument("--latency", type=float, default=0.05, help="fake server latency per request (s)")
+    ap.add_argument("--feed-items", type=int, default=5000, help="items of synthetic feed history")
+    ap.add_argument("--cards", type=int, default=2000, help="pipeline cards pre-seeded per site page")
+    ap.add_argument("--pdfs", type=int, default=20, help="publication PDFs")
+    ap.add_argument("--pdf-kb", type=int, default=512, help="size of each PDF in KiB")
+    ap.add_argument("--repeat", type=int, default=3, help="fresh-corpus repetitions")
+    ap.add_argument("--out", type=pathlib.Path, help="write results JSON here (default: stdout)")
+    ap.add_argument("--compare", type=pathlib.Path, help="baseline results JSON to compare against")
+    args = ap.parse_args(argv)
+
+    server = FakeArxiv(args.latency, id_offset=args.feed_items)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    raw: dict[str, list[float]] = {}
+    try:
+        for _ in range(args.repeat):
+            run_once(args, raw, server)
+    finally:
+        server.shutdown()
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "params": {k: (str(v) if isinstance(v, pathlib.Path) else v) for k, v in vars(args).items()},
+            "httpRequests": server.requests,
+        },
+        "stages": {
+            name: {"runs": runs, "min": min(runs), "median": statistics.median(runs), "max": max(runs)}
+            for name, runs in raw.items()
+        },
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+        for name, st in result["stages"].items():
+            print(f"{name:32s} {st['median']*1000:10.1f} ms")
+    else:
+        print(text)
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
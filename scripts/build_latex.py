@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Incremental LaTeX build for Cohera candidates.
+
+Compiles every standalone document (a .tex file with \\documentclass) under
+research/latex/ and research/drafts/ that carries the Candidate exit label
+[STATUS: READY FOR COMPILATION], and drops the PDF into
+research/publications/final/ for the publications sync to pick up.
+
+A document is rebuilt only when the content of the document, or of any file
+it pulls in through \\input, \\include, \\includegraphics or \\bibliography,
+changed since its last build (or the compiler command, or the executable it
+resolves to, did). A compiler that cannot be started is not recorded as a
+failed build, so installing it is enough for the next run. Documents are
+compiled in parallel, each by its own compiler process.
+
+    python3 scripts/build_latex.py
+    python3 scripts/build_latex.py --dry-run
+    COHERA_LATEX_CMD='tectonic --outdir {outdir} {source}' python3 scripts/build_latex.py
+
+The compiler command is a template: {source} (absolute path of the .tex
+file), {outdir}, {jobname} and {srcdir} are substituted per argument after
+splitting, so paths with spaces need no quoting. It runs in the document's
+directory and must leave {outdir}/{jobname}.pdf.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import datetime as dt
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SOURCE_DIRS = [ROOT / "research" / "latex", ROOT / "research" / "drafts"]
+FINAL_DIR = ROOT / "research" / "publications" / "final"
+BUILD_DIR = ROOT / "research" / "pipeline" / "cache" / "latex"
+MANIFEST_FILE = ROOT / "research" / "pipeline" / "cache" / "latex.json"
+READY_LABEL = "[STATUS: READY FOR COMPILATION]"
+DEFAULT_COMPILER = "latexmk -pdf -interaction=nonstopmode -halt-on-error -outdir={outdir} {source}"
+COMPILER = os.environ.get("COHERA_LATEX_CMD", DEFAULT_COMPILER)
+COMPILE_TIMEOUT_S = float(os.environ.get("COHERA_LATEX_TIMEOUT", "600"))
+LOG_TAIL_LINES = 20
+
+# TeX resolves \input and friends against the directory it runs in, i.e. the
+# main document's, not the including file's; names without an extension get
+# the first existing one of the listed suffixes.
+_COMMENT_RE = re.compile(r"(?<!\\)%.*")
+_DEP_RES = [
+    (re.compile(r"\\(?:input|include|subfile)\s*\{([^}]+)\}"), (".tex",), True),
+    (re.compile(r"\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}"), (".pdf", ".png", ".jpg", ".jpeg", ".eps"), False),
+    (re.compile(r"\\(?:bibliography|addbibresource)\s*\{([^}]+)\}"), (".bib",), False),
+]
+_DOCUMENTCLASS_RE = re.compile(r"\\documentclass\b")
+
+
+def read_tex(path: pathlib.Path) -> str:
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+def _resolve(base: pathlib.Path, name: str, suffixes: tuple[str, ...]) -> pathlib.Path:
+    name = name.strip()
+    candidates = [base / name] if pathlib.PurePath(name).suffix else [base / f"{name}{s}" for s in suffixes] + [base / name]
+    for c in candidates:
+        if c.is_file():
+            return c
+    return candidates[0]  # missing; tracked so the document rebuilds once it appears
+
+
+def scan_dependencies(doc: pathlib.Path) -> list[pathlib.Path]:
+    """Every file `doc` pulls in, recursively through \\input/\\include (missing ones included)."""
+    base = doc.parent
+    seen: set[pathlib.Path] = {doc}
+    deps: list[pathlib.Path] = []
+    pending = [doc]
+    while pending:
+        text = _COMMENT_RE.sub("", read_tex(pending.pop()))
+        for pattern, suffixes, recurse in _DEP_RES:
+            for m in pattern.finditer(text):
+                for name in m.group(1).split(","):
+                    if not name.strip():
+                        continue
+                    dep = _resolve(base, name, suffixes)
+                    if dep in seen:
+                        continue
+                    seen.add(dep)
+                    deps.append(dep)
+                    if recurse and dep.is_file():
+                        pending.append(dep)
+    return sorted(deps)
+
+
+def find_documents(dirs: list[pathlib.Path] | None = None) -> list[pathlib.Path]:
+    """Standalone documents (\\documentclass outside comments); fragments are only dependencies."""
+    docs = []
+    for d in SOURCE_DIRS if dirs is None else dirs:
+        for p in sorted(d.rglob("*.tex")) if d.exists() else ():
+            if _DOCUMENTCLASS_RE.search(_COMMENT_RE.sub("", read_tex(p))):
+                docs.append(p)
+    return docs
+
+
+def is_ready(doc: pathlib.Path) -> bool:
+    return READY_LABEL in read_tex(doc)
+
+
+def pdf_name(doc: pathlib.Path) -> str:
+    """'research/latex/MAIN PAPER/main.tex' -> 'MAIN_PAPER_main.pdf'."""
+    for d in SOURCE_DIRS:
+        try:
+            rel = doc.relative_to(d)
+            break
+        except ValueError:
+            continue
+    else:
+        rel = pathlib.Path(doc.name)
+    return re.sub(r"\s+", "_", "_".join(rel.with_suffix("").parts)) + ".pdf"
+
+
+def _rel(path: pathlib.Path) -> str:
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def file_digest(path: pathlib.Path, stats: dict) -> str | None:
+    """sha256 of a file, reusing `stats` entries ({rel: [size, mtimeNs, sha]}) while the stat matches."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    rel = _rel(path)
+    prev = stats.get(rel)
+    if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+        return prev[2]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    stats[rel] = [st.st_size, st.st_mtime_ns, digest]
+    return digest
+
+
+def compiler_identity(compiler: str) -> str:
+    """The command template plus the executable it resolves to on PATH."""
+    try:
+        exe = shlex.split(compiler)[0]
+    except (ValueError, IndexError):
+        return compiler
+    return f"{compiler}\0{shutil.which(exe) or ''}"
+
+
+def build_key(doc: pathlib.Path, deps: list[pathlib.Path], compiler: str, stats: dict) -> str:
+    parts = [compiler] + [f"{_rel(p)}\0{file_digest(p, stats)}" for p in [doc, *deps]]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+        manifest.setdefault("docs", {})
+        manifest.setdefault("files", {})
+        return manifest
+    except Exception:
+        return {"docs": {}, "files": {}}
+
+
+def save_manifest(manifest: dict) -> None:
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_name(MANIFEST_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    tmp.replace(MANIFEST_FILE)
+
+
+def compile_document(job: dict) -> dict:
+    """Run the compiler for one document; returns {ok, started, seconds, log}."""
+    source = pathlib.Path(job["source"])
+    outdir = pathlib.Path(job["outdir"])
+    outdir.mkdir(parents=True, exist_ok=True)
+    pdf = outdir / f"{source.stem}.pdf"
+    pdf.unlink(missing_ok=True)  # never publish a stale PDF from a failed run
+    fields = {"{source}": str(source), "{outdir}": str(outdir), "{jobname}": source.stem, "{srcdir}": str(source.parent)}
+    argv = []
+    for arg in shlex.split(job["command"]):
+        for k, v in fields.items():
+            arg = arg.replace(k, v)
+        argv.append(arg)
+    t0 = time.perf_counter()
+    started = True
+    try:
+        proc = subprocess.run(
+            argv, cwd=source.parent, stdin=subprocess.DEVNULL, capture_output=True, text=True, errors="replace", timeout=job["timeout"]
+        )
+        log, ok = proc.stdout + proc.stderr, proc.returncode == 0 and pdf.is_file()
+        if proc.returncode == 0 and not ok:
+            log += f"\ncompiler exited 0 but left no {pdf}\n"
+        # 126/127: a wrapper (env, sh -c, ...) could not run the compiler itself.
+        started = proc.returncode not in (126, 127)
+    except subprocess.TimeoutExpired as e:
+        log, ok = f"{type(e).__name__}: {e}\n", False
+    except OSError as e:
+        log, ok, started = f"{type(e).__name__}: {e}\n", False, False
+    (outdir / "build.log").write_text(log, encoding="utf-8")
+    return {"ok": ok, "started": started, "seconds": round(time.perf_counter() - t0, 3), "pdf": str(pdf), "log": log}
+
+
+def publish_pdf(src: pathlib.Path, name: str) -> pathlib.Path:
+    FINAL_DIR.mkdir(parents=True, exist_ok=True)
+    dst = FINAL_DIR / name
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copyfile(src, tmp)
+    tmp.replace(dst)
+    return dst
+
+
+def plan(docs: list[pathlib.Path], manifest: dict, compiler: str, force: bool = False) -> tuple[list[dict], dict]:
+    """Jobs for ready documents whose build key changed, plus counts of what was passed over."""
+    counts = {"documents": len(docs), "notReady": 0, "unchanged": 0}
+    names: dict[str, pathlib.Path] = {}
+    jobs: list[dict] = []
+    identity = compiler_identity(compiler)
+    for doc in docs:
+        if not is_ready(doc):
+            counts["notReady"] += 1
+            continue
+        name = pdf_name(doc)
+        if name in names:
+            raise SystemExit(f"{_rel(doc)} and {_rel(names[name])} would both publish {name}")
+        names[name] = doc
+        deps = scan_dependencies(doc)
+        key = build_key(doc, deps, identity, manifest["files"])
+        prev = manifest["docs"].get(_rel(doc))
+        # A failed build is not retried until its sources (or the compiler) change.
+        # Failures to start the compiler are never recorded, so they always retry.
+        if not force and prev and prev["key"] == key and (not prev["ok"] or (FINAL_DIR / name).is_file()):
+            counts["unchanged"] += 1
+            continue
+        jobs.append(
+            {
+                "doc": _rel(doc),
+                "source": str(doc),
+                "outdir": str(BUILD_DIR / name[:-4]),
+                "name": name,
+                "key": key,
+                "deps": [_rel(p) for p in deps],
+                "command": compiler,
+                "timeout": COMPILE_TIMEOUT_S,
+            }
+        )
+    return jobs, counts
+
+
+def build(
+    docs: list[pathlib.Path] | None = None,
+    compiler: str = COMPILER,
+    workers: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """Compile what changed; returns a report with per-document results."""
+    manifest = load_manifest()
+    jobs, counts = plan(find_documents() if docs is None else docs, manifest, compiler, force)
+    report: dict = {**counts, "built": [], "failed": []}
+    if dry_run or not jobs:
+        report["pending"] = [job["doc"] for job in jobs]
+        if not dry_run:
+            save_manifest(manifest)  # refreshed file stats
+        return report
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    # Threads only wait on the compiler processes, one per document.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latex") as pool:
+        futures = {pool.submit(compile_document, job): job for job in jobs}
+        for fut in concurrent.futures.as_completed(futures):
+            job = futures[fut]
+            result = fut.result()
+            entry = {
+                "key": job["key"],
+                "ok": result["ok"],
+                "pdf": job["name"],
+                "deps": job["deps"],
+                "seconds": result["seconds"],
+                "builtAt": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            }
+            if result["ok"]:
+                publish_pdf(pathlib.Path(result["pdf"]), job["name"])
+                report["built"].append({"doc": job["doc"], "pdf": job["name"], "seconds": result["seconds"]})
+            else:
+                tail = "\n".join(result["log"].splitlines()[-LOG_TAIL_LINES:])
+                report["failed"].append({"doc": job["doc"], "log": str(pathlib.Path(job["outdir"]) / "build.log"), "tail": tail})
+            if result["started"]:  # a missing or unrunnable compiler is no verdict on the document
+                manifest["docs"][job["doc"]] = entry
+            save_manifest(manifest)  # progress survives an interrupted build
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    global ROOT, SOURCE_DIRS, FINAL_DIR, BUILD_DIR, MANIFEST_FILE
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("docs", nargs="*", type=pathlib.Path, help="only these .tex documents (default: every one found)")
+    ap.add_argument("--root", type=pathlib.Path, default=None, help="repo checkout to build in (default: this script's)")
+    ap.add_argument("--compiler", default=COMPILER, help="compiler command template (default: $COHERA_LATEX_CMD or latexmk)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="documents compiled at once (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="rebuild ready documents even if unchanged")
+    ap.add_argument("--dry-run", action="store_true", help="list the documents that would be compiled")
+    args = ap.parse_args(argv)
+
+    if args.root:
+        ROOT = args.root.resolve()
+        SOURCE_DIRS = [ROOT / "research" / "latex", ROOT / "research" / "drafts"]
+        FINAL_DIR = ROOT / "research" / "publications" / "final"
+        BUILD_DIR = ROOT / "research" / "pipeline" / "cache" / "latex"
+        MANIFEST_FILE = ROOT / "research" / "pipeline" / "cache" / "latex.json"
+    docs = [d.resolve() for d in args.docs] or None
+    report = build(docs, compiler=args.compiler, workers=args.jobs, force=args.force, dry_run=args.dry_run)
+
+    for b in report["built"]:
+        print(f"built {b['doc']} -> {_rel(FINAL_DIR / b['pdf'])} ({b['seconds']:.1f}s)")
+    for f in report["failed"]:
+        print(f"FAILED {f['doc']} (log: {_rel(pathlib.Path(f['log']))})\n{f['tail']}", file=sys.stderr)
+    for doc in report.get("pending", []) if args.dry_run else ():
+        print(f"would build {doc}")
+    print(
+        f"LaTeX build: documents={report['documents']} not-ready={report['notReady']} unchanged={report['unchanged']} "
+        f"built={len(report['built'])} failed={len(report['failed'])}"
+    )
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@
 
 set -euo pipefail
 
-REPO_ROOT="/home/xavier/.openclaw/workspace/cohera-repo"
+REPO_ROOT="${COHERA_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)}"
 SRC_DIR="$REPO_ROOT/research/publications/final"
 DST_DIR="$REPO_ROOT/site/publications/pdf"
 
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Incremental deploy of site/ to the web host.
+
+Hashes every file under site/, diffs the result against the manifest left on
+the target by the previous deploy, uploads only added or changed files and
+deletes removed ones one by one; the target is never wiped. HTML, CSS, JS and
+JSON files get precompressed .gz (and .br, when the brotli module is
+installed) siblings, compressed only when their source changed.
+
+    python3 scripts/deploy_site.py --target /tmp/site-copy
+    python3 scripts/deploy_site.py --target sftp://user@host:65002/public_html/cohera
+    python3 scripts/deploy_site.py --target /tmp/site-copy --dry-run
+
+A local directory target behaves exactly like the remote one, which makes
+deploys testable offline. sftp:// targets use the system sftp client (one
+batch session per deploy), so keys and known_hosts come from ssh as usual;
+the URL path is relative to the login directory unless it starts with //.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+try:
+    import brotli  # optional: .br siblings are skipped without it
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SITE = ROOT / "site"
+MANIFEST_NAME = ".deploy-manifest.json"
+MANIFEST_FORMAT = "cohera-deploy/1"
+EXCLUDE = ["*.log", "*.tmp", ".*.tmp", ".gitkeep", ".DS_Store", MANIFEST_NAME]
+COMPRESS_SUFFIXES = (".html", ".css", ".js", ".json", ".svg")
+COMPRESS_MIN_BYTES = 1024  # smaller files gain nothing from a sibling
+
+
+def excluded(rel: str) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(name, pat) for pat in EXCLUDE)
+
+
+def file_sha256(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def encodings() -> list[str]:
+    return ["gzip", "br"] if brotli is not None else ["gzip"]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)  # fixed mtime: same input, same bytes
+    return brotli.compress(data, quality=11)
+
+
+_SIBLING_SUFFIX = {"gzip": ".gz", "br": ".br"}
+
+
+def build_manifest(site: pathlib.Path) -> dict[str, dict]:
+    """
+    rel path -> {"digest", "source", "encoding"} for every file to
+    deploy. Siblings are keyed by their source's digest plus the encoding, so
+    nothing is compressed just to find out it did not change.
+    """
+    files: dict[str, dict] = {}
+    for path in sorted(site.rglob("*")):
+        rel = path.relative_to(site).as_posix()
+        if not path.is_file() or excluded(rel):
+            continue
+        digest = file_sha256(path)
+        files[rel] = {"digest": digest, "source": rel, "encoding": None}
+        if path.suffix.lower() in COMPRESS_SUFFIXES and path.stat().st_size >= COMPRESS_MIN_BYTES:
+            for enc in encodings():
+                files[rel + _SIBLING_SUFFIX[enc]] = {"digest": f"{digest}+{enc}", "source": rel, "encoding": enc}
+    return files
+
+
+def diff_manifests(new: dict[str, dict], old: dict[str, str]) -> tuple[list[str], list[str]]:
+    """(paths to upload, paths to delete); uploads put pages after the assets they reference."""
+    upload = [rel for rel, entry in new.items() if old.get(rel) != entry["digest"]]
+    upload.sort(key=lambda rel: (new[rel]["source"].endswith(".html"), rel))
+    delete = sorted(rel for rel in old if rel not in new)
+    return upload, delete
+
+
+class LocalTarget:
+    """A directory standing in for the web root (tests, previews, mounted hosts)."""
+
+    def __init__(self, root: pathlib.Path):
+        self.root = pathlib.Path(root)
+
+    def read_manifest(self) -> dict | None:
+        try:
+            return json.loads((self.root / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def apply(self, uploads: list[tuple[str, pathlib.Path]], deletes: list[str], manifest: bytes) -> None:
+        for rel, src in uploads:
+            self._write(rel, src.read_bytes())
+        for rel in deletes:
+            (self.root / rel).unlink(missing_ok=True)
+        self._write(MANIFEST_NAME, manifest)
+
+    def _write(self, rel: str, data: bytes) -> None:
+        dst = self.root / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(dst)
+
+
+def _sftp_quote(path: str) -> str:
+    return '"' + path.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class SftpTarget:
+    """sftp://user@host[:port]/path, driven through the system sftp client in batch mode."""
+
+    def __init__(self, url: str, identity: str | None = None):
+        parts = urllib.parse.urlsplit(url)
+        self.dest = f"{parts.username}@{parts.hostname}" if parts.username else parts.hostname
+        self.port = str(parts.port or 22)
+        # Like scp: sftp://host/dir is relative to the login directory, sftp://host//dir absolute.
+        self.path = urllib.parse.unquote(parts.path)[1:].rstrip("/") or "."
+        self.identity = identity
+
+    def _sftp(self, *args: str) -> list[str]:
+        cmd = ["sftp", "-q", "-P", self.port, "-o", "BatchMode=yes"]
+        if self.identity:
+            cmd += ["-i", self.identity]
+        return cmd + list(args)
+
+    def read_manifest(self) -> dict | None:
+        with tempfile.TemporaryDirectory() as tmp:
+            local = pathlib.Path(tmp) / MANIFEST_NAME
+            proc = subprocess.run(
+                self._sftp(f"{self.dest}:{self.path}/{MANIFEST_NAME}", str(local)), capture_output=True, text=True
+            )
+            if proc.returncode != 0 or not local.exists():
+                return None  # first deploy to this target
+            try:
+                return json.loads(local.read_text(encoding="utf-8"))
+            except ValueError:
+                return None
+
+    def apply(self, uploads: list[tuple[str, pathlib.Path]], deletes: list[str], manifest: bytes) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_file = pathlib.Path(tmp) / MANIFEST_NAME
+            manifest_file.write_bytes(manifest)
+            # Create the target directory itself first, like the old `mkdir -p` step.
+            lines = []
+            parts = self.path.split("/")
+            for i in range(2 if self.path.startswith("/") else 1, len(parts) + 1):
+                if parts[i - 1] not in ("", "."):
+                    lines.append(f"-mkdir {_sftp_quote('/'.join(parts[:i]))}")
+            made: set[str] = set()
+            for rel, src in uploads + [(MANIFEST_NAME, manifest_file)]:
+                parent = rel.rpartition("/")[0]
+                steps = parent.split("/") if parent else []
+                for i in range(1, len(steps) + 1):
+                    d = "/".join(steps[:i])
+                    if d not in made:
+                        made.add(d)
+                        lines.append(f"-mkdir {_sftp_quote(f'{self.path}/{d}')}")  # '-': already exists is fine
+                if rel == MANIFEST_NAME:
+                    # Deletions go before the manifest: it is written last, once the tree matches it.
+                    lines += [f"-rm {_sftp_quote(f'{self.path}/{d}')}" for d in deletes]
+                lines.append(f"put {_sftp_quote(str(src))} {_sftp_quote(f'{self.path}/{rel}')}")
+            batch = pathlib.Path(tmp) / "batch"
+            batch.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            proc = subprocess.run(self._sftp("-b", str(batch), self.dest), capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"sftp batch failed ({proc.returncode}): {proc.stderr.strip()[-500:]}")
+
+
+def open_target(spec: str, identity: str | None = None) -> LocalTarget | SftpTarget:
+    if spec.startswith("sftp://"):
+        return SftpTarget(spec, identity)
+    return LocalTarget(pathlib.Path(spec))
+
+
+def deploy(site: pathlib.Path, target: LocalTarget | SftpTarget, dry_run: bool = False) -> dict:
+    """Upload what changed since the target's last deploy; returns counts and byte totals."""
+    t0 = time.perf_counter()
+    new = build_manifest(site)
+    previous = target.read_manifest() or {}
+    old = previous.get("files", {}) if previous.get("format") == MANIFEST_FORMAT else {}
+    upload, delete = diff_manifests(new, old)
+    report = {
+        "files": len(new),
+        "uploaded": len(upload),
+        "deleted": len(delete),
+        "bytes": 0,
+        "firstDeploy": not old,
+        "upload": upload,
+        "delete": delete,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="cohera-deploy-") as tmp:
+        staged: list[tuple[str, pathlib.Path]] = []
+        for rel in upload:
+            entry = new[rel]
+            src = site / entry["source"]
+            if entry["encoding"]:
+                out = pathlib.Path(tmp) / rel
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_bytes(compress(src.read_bytes(), entry["encoding"]))
+                src = out
+            report["bytes"] += src.stat().st_size
+            staged.append((rel, src))
+        if not dry_run and (upload or delete or not old):
+            manifest = {"format": MANIFEST_FORMAT, "files": {rel: e["digest"] for rel, e in new.items()}}
+            target.apply(staged, delete, json.dumps(manifest, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--target", default=os.environ.get("COHERA_DEPLOY_TARGET"), help="directory or sftp://user@host[:port]/path")
+    ap.add_argument("--site", type=pathlib.Path, default=SITE, help="directory to deploy (default: site/)")
+    ap.add_argument("--identity", default=None, help="ssh private key for sftp:// targets")
+    ap.add_argument("--dry-run", action="store_true", help="show what would be uploaded and deleted")
+    ap.add_argument("-v", "--verbose", action="store_true", help="list every uploaded and deleted path")
+    args = ap.parse_args(argv)
+    if not args.target:
+        ap.error("--target (or $COHERA_DEPLOY_TARGET) is required")
+
+    report = deploy(args.site, open_target(args.target, args.identity), dry_run=args.dry_run)
+    if args.verbose or args.dry_run:
+        for rel in report["upload"]:
+            print(f"put {rel}")
+        for rel in report["delete"]:
+            print(f"rm  {rel}")
+    note = " (first deploy to this target)" if report["firstDeploy"] else ""
+    print(
+        f"Deploy{' (dry run)' if args.dry_run else ''}: files={report['files']} uploaded={report['uploaded']} "
+        f"deleted={report['deleted']} bytes={report['bytes']} wall={report['seconds']:.2f}s -> "
+        f"{shlex.quote(args.target)}{note}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
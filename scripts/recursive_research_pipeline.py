@@ -5,27 +5,80 @@ Append-only Cohera recursive research pipeline.
 Safety rule:
 - Never rewrite website structure/CSS/layout.
 - Only append new cards/entries into existing Home/Research/Publications grids.
+
+Stages run together (no arguments, or `all`) or one at a time, each reading
+its inputs from the state the previous one persisted. Local stages never load
+the network stack, and running the module with -m reuses its cached bytecode,
+so cron can poll arXiv rarely and run the cheap stages often:
+
+    0 */6 * * *   cd $REPO && python3 -m scripts.recursive_research_pipeline discover
+    */10 * * * *  cd $REPO && python3 -m scripts.recursive_research_pipeline ingest
+    */10 * * * *  cd $REPO && python3 -m scripts.recursive_research_pipeline digest
+    */10 * * * *  cd $REPO && python3 -m scripts.recursive_research_pipeline render
+    */30 * * * *  cd $REPO && python3 -m scripts.recursive_research_pipeline sync-pdfs
+
+The checkout defaults to the one this script lives in ($COHERA_ROOT or
+--root override it).
 """
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import collections
+import contextlib
 import datetime as dt
-import html
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
+import os
 import pathlib
+import posixpath
+import queue
+import random
 import re
-import textwrap
+import shutil
+import signal
+import sys
+import threading
+import time
 import urllib.parse
-import urllib.request
-import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    # Loaded on first use by the network stages, so local stages start without them.
+    import concurrent.futures
+    import http.client
+    import xml.etree.ElementTree as ET
 
-ROOT = pathlib.Path("/home/xavier/.openclaw/workspace/cohera-repo")
+# The checkout this script lives in, unless $COHERA_ROOT or --root points elsewhere.
+ROOT = pathlib.Path(os.environ.get("COHERA_ROOT") or pathlib.Path(__file__).resolve().parent.parent)
 SITE = ROOT / "site"
 RESEARCH = ROOT / "research"
 STATE_DIR = RESEARCH / "pipeline"
 SOURCES_DIR = RESEARCH / "sources" / "arxiv"
+SOURCE_OBJECTS_DIR = SOURCES_DIR / "objects"
 DIGESTS_DIR = RESEARCH / "digests"
-STATE_FILE = STATE_DIR / "feed.json"
+DIGEST_INDEX_FILE = DIGESTS_DIR / "index.tsv"
+STATE_FILE = STATE_DIR / "feed.json"  # legacy whole-file feed, imported once into the feed log
+FEED_LOG = STATE_DIR / "feed.jsonl"
+FEED_INDEX = STATE_DIR / "feed.idx"
+CACHE_DIR = STATE_DIR / "cache"
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+BM25_INDEX_FILE = CACHE_DIR / "bm25.json"
+BM25_DELTA_FILE = CACHE_DIR / "bm25.delta.jsonl"
+DEDUP_INDEX_FILE = CACHE_DIR / "dedup.json"
+PAGE_INDEX_FILE = CACHE_DIR / "pages.json"
+PDF_MANIFEST_FILE = CACHE_DIR / "pdfs.json"
+METRICS_FILE = CACHE_DIR / "metrics.jsonl"
+PROFILE_DIR = CACHE_DIR / "profiles"
+JOURNAL_DIR = CACHE_DIR / "journal"
+SEARCH_DIR = SITE / "search"
+SEARCH_STATE_FILE = CACHE_DIR / "search.json"
+STAGE_STATE_FILE = STATE_DIR / "stages.json"
 TZ = dt.timezone(dt.timedelta(hours=-5))
 
 TOPICS = [
@@ -36,15 +89,54 @@ TOPICS = [
     "digital twins uncertainty",
 ]
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+USER_AGENT = "cohera-research-pipeline/1.0 (+https://sciencecoherence.com/cohera/)"
+
 MAX_FETCH_PER_TOPIC = 8
+FETCH_TIMEOUT_S = 25.0
+FETCH_RETRIES = 3
+FETCH_BACKOFF_S = 2.0
+DISCOVERY_WORKERS = int(os.environ.get("COHERA_DISCOVERY_WORKERS", "4"))
+DISCOVERY_DEADLINE_S = float(os.environ.get("COHERA_DISCOVERY_DEADLINE", "90"))
+DISCOVERY_BATCH_TOPICS = int(os.environ.get("COHERA_DISCOVERY_BATCH", "2"))  # topics ORed per query; 1 = one query per topic
+ARXIV_POLITE_DELAY_S = 3.0
+BACKFILL_PAGE_SIZE = 100
+DAEMON_FLUSH_S = float(os.environ.get("COHERA_DAEMON_FLUSH", "900"))
+DAEMON_TOPIC_INTERVAL_S = 3600.0
+DAEMON_MIN_INTERVAL_S = 900.0
+DAEMON_MAX_INTERVAL_S = 6 * 3600.0
+DAEMON_JITTER = 0.1
+TOPIC_INTERVALS_S: dict[str, float] = {}  # per-topic base polling interval overrides
+HTTP_CACHE_TTL_S = float(os.environ.get("COHERA_HTTP_CACHE_TTL", "900"))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("COHERA_HTTP_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
 MAX_NEW_PER_RUN = 8
+FEED_WINDOW = 400
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_HIT_SCORE = 5.0  # a BM25 score this high counts as one full evidence hit
+BM25_COMPACT_DOCS = 2000  # delta-log documents replayed on open before the base file is rewritten
+EVIDENCE_TOP_K = 40
+EVIDENCE_SHOWN = 3  # strongest matches cited on a thread update card
+SIMHASH_BANDS = 4  # 64-bit signatures split into 16-bit LSH bands
+SIMHASH_MAX_DISTANCE = 3  # Hamming distance at or below which two papers are the same text
+SIMHASH_MIN_TOKENS = 12  # shorter texts are too generic to call near-duplicates
 MAX_HOME_NEWS = 1
 MAX_RESEARCH_FEED = 1
 MAX_PUBLICATIONS = 24
+CARDS_PER_PAGE = 30
+SEARCH_PREFIX_LEN = 2  # term shards start out keyed by this many leading characters
+SEARCH_SHARD_MAX_BYTES = 64 * 1024  # a bigger term shard splits on the next character
+SEARCH_DOC_SHARD = 64  # documents per doc shard; an update rewrites at most the last one or two
+SEARCH_DELTA_SEGMENTS = 16  # per-update delta segments kept before compacting into the term shards
+SEARCH_DELTA_MAX_BYTES = 256 * 1024
+SEARCH_SNIPPET_CHARS = 200
+
+
+_CLOCK: Callable[[], dt.datetime] | None = None  # simulated clock (replay)
 
 
 def now_lima() -> dt.datetime:
-    return dt.datetime.now(TZ)
+    return _CLOCK() if _CLOCK is not None else dt.datetime.now(TZ)
 
 
 def slugify(text: str) -> str:
@@ -54,10 +146,50 @@ def slugify(text: str) -> str:
 
 
 def ensure_dirs() -> None:
-    for p in [STATE_DIR, SOURCES_DIR, DIGESTS_DIR, SITE / "publications" / "pdf"]:
+    for p in [STATE_DIR, HTTP_CACHE_DIR, SOURCES_DIR, SOURCE_OBJECTS_DIR, DIGESTS_DIR, SITE / "publications" / "pdf"]:
         p.mkdir(parents=True, exist_ok=True)
 
 
+def set_root(root: pathlib.Path) -> None:
+    """Point every path at another repo checkout (scratch copies, benchmarks) and drop cached state."""
+    global ROOT, SITE, RESEARCH, STATE_DIR, SOURCES_DIR, SOURCE_OBJECTS_DIR, DIGESTS_DIR, DIGEST_INDEX_FILE, STATE_FILE
+    global FEED_LOG, FEED_INDEX, CACHE_DIR, HTTP_CACHE_DIR, BM25_INDEX_FILE, BM25_DELTA_FILE, PAGE_INDEX_FILE, PDF_MANIFEST_FILE, METRICS_FILE
+    global PROFILE_DIR, JOURNAL_DIR, DEDUP_INDEX_FILE, SEARCH_DIR, SEARCH_STATE_FILE, STAGE_STATE_FILE
+    global THREAD_STATE_FILE, THREAD_REGISTRY_FILE, NEWS_STATE_FILE, _HTTP_CACHE, _PAGE_INDEX, _THREAD_REGISTRY, _DIGEST_INDEX
+    ROOT = pathlib.Path(root)
+    SITE = ROOT / "site"
+    RESEARCH = ROOT / "research"
+    STATE_DIR = RESEARCH / "pipeline"
+    SOURCES_DIR = RESEARCH / "sources" / "arxiv"
+    SOURCE_OBJECTS_DIR = SOURCES_DIR / "objects"
+    DIGESTS_DIR = RESEARCH / "digests"
+    DIGEST_INDEX_FILE = DIGESTS_DIR / "index.tsv"
+    STATE_FILE = STATE_DIR / "feed.json"
+    FEED_LOG = STATE_DIR / "feed.jsonl"
+    FEED_INDEX = STATE_DIR / "feed.idx"
+    CACHE_DIR = STATE_DIR / "cache"
+    HTTP_CACHE_DIR = CACHE_DIR / "http"
+    BM25_INDEX_FILE = CACHE_DIR / "bm25.json"
+    BM25_DELTA_FILE = CACHE_DIR / "bm25.delta.jsonl"
+    DEDUP_INDEX_FILE = CACHE_DIR / "dedup.json"
+    PAGE_INDEX_FILE = CACHE_DIR / "pages.json"
+    PDF_MANIFEST_FILE = CACHE_DIR / "pdfs.json"
+    METRICS_FILE = CACHE_DIR / "metrics.jsonl"
+    PROFILE_DIR = CACHE_DIR / "profiles"
+    JOURNAL_DIR = CACHE_DIR / "journal"
+    SEARCH_DIR = SITE / "search"
+    SEARCH_STATE_FILE = CACHE_DIR / "search.json"
+    STAGE_STATE_FILE = STATE_DIR / "stages.json"
+    THREAD_STATE_FILE = STATE_DIR / "thread_state.json"
+    THREAD_REGISTRY_FILE = STATE_DIR / "threads.json"
+    NEWS_STATE_FILE = STATE_DIR / "news_state.json"
+    _HTTP_CACHE = None
+    _PAGE_INDEX = None
+    _THREAD_REGISTRY = None
+    _DIGEST_INDEX = None
+    reset_relevance_cache()
+
+
 def strip_html_text(s: str) -> str:
     return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", "", s)).strip()
 
@@ -71,84 +203,1496 @@ def load_state() -> dict:
         return {"items": []}
 
 
-def save_state(state: dict) -> None:
-    STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+# Item model: papers travel as Item objects. Identity, dates and tags sit in
+# __slots__ (topic, source, kind and status strings interned); the bulky
+# summary and author list are held only until the item has been written out
+# of line -- its feed log record or its source object -- and are read back
+# from there on demand (digest, cards, indexing). Items answer the dict
+# calls the pipeline makes (get, [], in, []=) and to_dict() gives the plain
+# record for JSON, so plain dicts (legacy feed, resumed checkpoints) can be
+# used anywhere an Item is expected.
+ITEM_FIELDS = ("id", "title", "summary", "published", "authors", "pdf", "topic", "topics", "source", "addedAt", "kind", "status")
+_ITEM_SLOTS = frozenset(ITEM_FIELDS) - {"summary", "authors"}
+_ITEM_INTERNED = frozenset(("topic", "source", "kind", "status"))
+_MISSING = object()
+
+
+class Item:
+    __slots__ = (*sorted(_ITEM_SLOTS), "_summary", "_authors", "_ref", "_extra")
+
+    def __init__(self, record: dict, ref: tuple[str, int | str] | None = None):
+        for key in _ITEM_SLOTS:
+            setattr(self, key, _MISSING)
+        self._summary = self._authors = _MISSING
+        self._ref = ref
+        self._extra: dict | None = None
+        for key, value in record.items():
+            if ref is None or key not in ("summary", "authors"):
+                self[key] = value
+
+    def get(self, key: str, default=None):
+        if key == "summary" or key == "authors":
+            value = self._summary if key == "summary" else self._authors
+            if value is _MISSING and self._ref is not None:
+                value = self._load().get(key, _MISSING)
+        elif key in _ITEM_SLOTS:
+            value = getattr(self, key)
+        else:
+            value = self._extra.get(key, _MISSING) if self._extra else _MISSING
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == "summary":
+            self._summary = value
+        elif key == "authors":
+            self._authors = value
+        elif key in _ITEM_SLOTS:
+            if key in _ITEM_INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            elif key == "topics":
+                value = [sys.intern(t) for t in value]
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> list[str]:
+        return list(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"Item({self.get('id', '')!r})"
+
+    def to_dict(self) -> dict:
+        record = self._load() if self._ref is not None else {}
+        out = {}
+        for key in ITEM_FIELDS:
+            value = getattr(self, key) if key in _ITEM_SLOTS else (self._summary if key == "summary" else self._authors)
+            if value is _MISSING:
+                value = record.get(key, _MISSING)
+            if value is not _MISSING:
+                out[key] = value
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def copy(self) -> "Item":
+        dup = Item({}, self._ref)
+        for key in _ITEM_SLOTS:
+            setattr(dup, key, getattr(self, key))
+        dup._summary, dup._authors = self._summary, self._authors
+        dup._extra = dict(self._extra) if self._extra else None
+        return dup
+
+    def spill(self, ref: tuple[str, int | str]) -> None:
+        """Drop the in-memory summary/authors; `ref` ("feed", offset) or ("object", digest) holds them."""
+        self._ref = ref
+        self._summary = self._authors = _MISSING
+
+    def _load(self) -> dict:
+        kind, where = self._ref
+        if kind == "feed":
+            return feed_read([where], full=True)[0]
+        return json.loads(gzip.decompress(source_object_path(where).read_bytes()))
+
+
+def as_item(obj: Item | dict) -> Item:
+    return obj if isinstance(obj, Item) else Item(obj)
+
+
+def _json_default(obj):
+    if isinstance(obj, Item):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+# Feed store: append-only JSONL log of every admitted item plus a sidecar
+# index with one line per item: offset, length, published, topic, id.
+# Opening reads only the index; items are read from the log by offset.
+
+
+def _index_field(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def _index_topics(item: dict) -> str:
+    """Index field for an item's topics: '|'-joined, primary topic first."""
+    return "|".join(_index_field(t).replace("|", "/") for t in item.get("topics") or [item.get("topic", "")])
+
+
+def _feed_index_row(store: dict, offset: int, length: int, published: str, topic: str, paper_id: str) -> None:
+    row = (offset, length, published, topic, paper_id)
+    store["ids"][paper_id] = row
+    store["rows"].append(row)
+    bisect.insort(store["byPublished"], (published, offset))
+    for t in topic.split("|"):
+        store["byTopic"].setdefault(t, []).append(offset)
+    store["end"] = offset + length
+
+
+def _feed_index_log_tail(store: dict, start: int) -> list[str]:
+    """Index log records from byte `start` onward; returns the index lines to persist."""
+    lines: list[str] = []
+    with FEED_LOG.open("rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # torn final write; ignored until completed
+            try:
+                it = json.loads(raw)
+            except Exception:
+                offset += len(raw)
+                continue
+            pub, topic, pid = _index_field(it.get("published", "")), _index_topics(it), _index_field(it.get("id", ""))
+            _feed_index_row(store, offset, len(raw), pub, topic, pid)
+            lines.append(f"{offset}\t{len(raw)}\t{pub}\t{topic}\t{pid}\n")
+            offset += len(raw)
+    return lines
+
+
+def open_feed_store() -> dict:
+    store: dict = {"ids": {}, "rows": [], "byPublished": [], "byTopic": {}, "end": 0}
+    if not FEED_LOG.exists():
+        legacy = load_state().get("items", [])
+        FEED_LOG.parent.mkdir(parents=True, exist_ok=True)
+        journal_touch(FEED_LOG)
+        FEED_LOG.touch()
+        atomic_write(FEED_INDEX, "")
+        # Legacy feed is newest-first; the log is in admission order.
+        feed_append(store, list(reversed(legacy)))
+        return store
+
+    if FEED_INDEX.exists():
+        for line in FEED_INDEX.read_text(encoding="utf-8").splitlines():
+            parts = line.split("\t")
+            if len(parts) != 5:
+                continue
+            _feed_index_row(store, int(parts[0]), int(parts[1]), parts[2], parts[3], parts[4])
+
+    log_size = FEED_LOG.stat().st_size
+    if store["end"] > log_size:
+        # Index points past the log (log replaced or truncated): rebuild from scratch.
+        store = {"ids": {}, "rows": [], "byPublished": [], "byTopic": {}, "end": 0}
+        atomic_write(FEED_INDEX, "".join(_feed_index_log_tail(store, 0)))
+    elif store["end"] < log_size:
+        # Log has records the index missed (crash between the two appends).
+        journal_touch(FEED_INDEX, append=True)
+        with FEED_INDEX.open("a", encoding="utf-8") as f:
+            f.write("".join(_feed_index_log_tail(store, store["end"])))
+    return store
+
+
+def feed_has(store: dict, paper_id: str) -> bool:
+    return paper_id in store["ids"]
+
+
+def feed_append(store: dict, items: list[dict]) -> None:
+    """Append items (oldest first) to the log and the index."""
+    if not items:
+        return
+    index_lines: list[str] = []
+    journal_touch(FEED_LOG, append=True)
+    journal_touch(FEED_INDEX, append=True)
+    with FEED_LOG.open("ab") as f:
+        offset = f.tell()
+        for it in items:
+            record = it.to_dict() if isinstance(it, Item) else it
+            raw = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            f.write(raw)
+            if isinstance(it, Item):
+                it.spill(("feed", offset))
+            pub, topic, pid = _index_field(it.get("published", "")), _index_topics(it), _index_field(it.get("id", ""))
+            _feed_index_row(store, offset, len(raw), pub, topic, pid)
+            index_lines.append(f"{offset}\t{len(raw)}\t{pub}\t{topic}\t{pid}\n")
+            offset += len(raw)
+    with FEED_INDEX.open("a", encoding="utf-8") as f:
+        f.write("".join(index_lines))
+
+
+def feed_read(offsets: list[int], full: bool = False) -> list[Item] | list[dict]:
+    """Records at `offsets` as Items whose summary/authors stay in the log, or as full dicts."""
+    out: list = []
+    if not offsets:
+        return out
+    with FEED_LOG.open("rb") as f:
+        for off in offsets:
+            f.seek(off)
+            record = json.loads(f.readline())
+            out.append(record if full else Item(record, ("feed", off)))
+    return out
 
 
-def fetch_arxiv_topic(topic: str, max_results: int = MAX_FETCH_PER_TOPIC) -> list[dict]:
-    query = urllib.parse.quote(f"all:{topic}")
-    url = (
-        "http://export.arxiv.org/api/query?"
-        f"search_query={query}&start=0&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
-    )
-    with urllib.request.urlopen(url, timeout=25) as resp:
-        data = resp.read()
-
-    root = ET.fromstring(data)
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
-    out: list[dict] = []
-
-    for e in root.findall("atom:entry", ns):
-        title = strip_html_text(e.findtext("atom:title", default="", namespaces=ns))
-        summary = strip_html_text(e.findtext("atom:summary", default="", namespaces=ns))
-        paper_id = e.findtext("atom:id", default="", namespaces=ns).strip()
-        published = e.findtext("atom:published", default="", namespaces=ns).strip()
-        links = [ln.get("href", "") for ln in e.findall("atom:link", ns)]
-        pdf = next((x for x in links if x.endswith(".pdf")), "")
-        authors = [strip_html_text(a.findtext("atom:name", default="", namespaces=ns)) for a in e.findall("atom:author", ns)]
-        if not paper_id or not title:
-            continue
-        out.append(
-            {
-                "id": paper_id,
-                "title": title,
-                "summary": summary,
-                "published": published,
-                "authors": [a for a in authors if a],
-                "pdf": pdf,
-                "topic": topic,
-                "source": "arXiv",
-            }
+def feed_lookup(paper_ids: list[str], store: dict | None = None) -> list[Item]:
+    """Stored items for `paper_ids`, in the given order; ids not in the store are skipped."""
+    if not paper_ids:
+        return []
+    store = store or open_feed_store()
+    return feed_read([store["ids"][pid][0] for pid in paper_ids if pid in store["ids"]])
+
+
+def feed_recent(store: dict, n: int = FEED_WINDOW) -> list[dict]:
+    """Most recently admitted items, newest first."""
+    return feed_read([row[0] for row in reversed(store["rows"][-n:])])
+
+
+def feed_query(
+    store: dict,
+    since: str = "",
+    until: str = "",
+    topic: str | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Items with since <= published < until (ISO prefixes), optionally tagged with `topic`; newest first."""
+    by_pub = store["byPublished"]
+    lo = bisect.bisect_left(by_pub, (since, -1)) if since else 0
+    hi = bisect.bisect_left(by_pub, (until, -1)) if until else len(by_pub)
+    offsets = [off for _, off in reversed(by_pub[lo:hi])]
+    if topic is not None:
+        wanted = set(store["byTopic"].get(topic, []))
+        offsets = [off for off in offsets if off in wanted]
+    return feed_read(offsets[:limit] if limit is not None else offsets)
+
+
+# Run metrics: main() wraps each stage in stage(), which records wall and CPU
+# time, bytes read/written by the process (Linux /proc/self/io) and the item
+# counts the stage reports. Each arXiv query adds its HTTP status,
+# latency, body bytes and cache outcome. One JSON record per run is appended
+# to METRICS_FILE, in the uncommitted cache directory; COHERA_METRICS_TEXTFILE
+# also writes a node_exporter textfile.
+_METRICS_LOCK = threading.Lock()
+_RUN_METRICS: dict = {"stages": {}, "http": {}, "counters": {}, "picks": {}}
+
+
+def reset_run_metrics() -> dict:
+    global _RUN_METRICS
+    _RUN_METRICS = {"startedAt": now_lima().isoformat(), "stages": {}, "http": {}, "counters": {}, "picks": {}}
+    return _RUN_METRICS
+
+
+def _proc_io() -> tuple[int, int]:
+    try:
+        fields = dict(line.split(": ") for line in pathlib.Path("/proc/self/io").read_text().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except Exception:
+        return 0, 0
+
+
+def count_metric(name: str, n: int = 1) -> None:
+    with _METRICS_LOCK:
+        counters = _RUN_METRICS["counters"]
+        counters[name] = counters.get(name, 0) + n
+
+
+def record_pick(name: str, value) -> None:
+    """Note a scheduling decision of this run (news ids, research thread or paper)."""
+    with _METRICS_LOCK:
+        _RUN_METRICS["picks"][name] = value
+
+
+def record_http(topic: str, status: int, latency_s: float, nbytes: int, cache: str) -> None:
+    with _METRICS_LOCK:
+        _RUN_METRICS["http"][topic] = {"status": status, "latencyS": round(latency_s, 4), "bytes": nbytes, "cache": cache}
+    count_metric(f"httpCache_{cache}")
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[dict]:
+    """Time a pipeline stage; the yielded dict takes extra fields such as itemsIn/itemsOut."""
+    rec: dict = {}
+    read0, written0 = _proc_io()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield rec
+    finally:
+        read1, written1 = _proc_io()
+        rec.update(
+            wallS=round(time.perf_counter() - wall0, 4),
+            cpuS=round(time.process_time() - cpu0, 4),
+            bytesRead=read1 - read0,
+            bytesWritten=written1 - written0,
         )
-    return out
+        _RUN_METRICS["stages"][name] = rec
 
 
-def discover_arxiv() -> list[dict]:
-    items: list[dict] = []
-    for t in TOPICS:
+class _CountingReader:
+    """File-like wrapper counting bytes pulled through read()."""
+
+    def __init__(self, raw: io.BufferedIOBase):
+        self.raw = raw
+        self.nbytes = 0
+
+    def read(self, n: int = -1) -> bytes:
+        data = self.raw.read(n)
+        self.nbytes += len(data)
+        return data
+
+
+def write_metrics(metrics: dict) -> None:
+    METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with METRICS_FILE.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    textfile = os.environ.get("COHERA_METRICS_TEXTFILE")
+    if not textfile:
+        return
+
+    def esc(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+    lines = [
+        "# HELP cohera_pipeline_last_run_timestamp_seconds Unix time the last pipeline run finished.",
+        "# TYPE cohera_pipeline_last_run_timestamp_seconds gauge",
+        f"cohera_pipeline_last_run_timestamp_seconds {time.time():.0f}",
+    ]
+    stage_fields = [
+        ("wallS", "stage_wall_seconds", "Wall time per stage."),
+        ("cpuS", "stage_cpu_seconds", "Process CPU time per stage."),
+        ("bytesRead", "stage_read_bytes", "Bytes read by the process during the stage."),
+        ("bytesWritten", "stage_written_bytes", "Bytes written by the process during the stage."),
+        ("itemsIn", "stage_items_in", "Items entering the stage."),
+        ("itemsOut", "stage_items_out", "Items leaving the stage."),
+    ]
+    for key, metric, help_text in stage_fields:
+        lines += [f"# HELP cohera_pipeline_{metric} {help_text}", f"# TYPE cohera_pipeline_{metric} gauge"]
+        for name, rec in metrics["stages"].items():
+            if key in rec:
+                lines.append(f'cohera_pipeline_{metric}{{stage="{esc(name)}"}} {rec[key]}')
+    http_fields = [
+        ("status", "http_status", "Last HTTP status per topic (0 = served from cache)."),
+        ("latencyS", "http_latency_seconds", "HTTP latency per topic."),
+        ("bytes", "http_body_bytes", "Response body bytes per topic."),
+    ]
+    for key, metric, help_text in http_fields:
+        lines += [f"# HELP cohera_pipeline_{metric} {help_text}", f"# TYPE cohera_pipeline_{metric} gauge"]
+        for topic, rec in metrics["http"].items():
+            lines.append(f'cohera_pipeline_{metric}{{topic="{esc(topic)}",cache="{rec["cache"]}"}} {rec[key]}')
+    lines += ["# HELP cohera_pipeline_counter Per-run event counters.", "# TYPE cohera_pipeline_counter gauge"]
+    for name, value in sorted(metrics["counters"].items()):
+        lines.append(f'cohera_pipeline_counter{{name="{esc(name)}"}} {value}')
+
+    out = pathlib.Path(textfile)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    tmp.replace(out)  # node_exporter must never see a partial file
+
+
+@contextlib.contextmanager
+def profiling(modes: list[str]) -> Iterator[dict]:
+    """Opt-in cProfile/tracemalloc capture; the yielded dict receives the results for write_profiles()."""
+    out: dict = {}
+    prof = None
+    if "cprofile" in modes:
+        import cProfile
+
+        prof = cProfile.Profile()
+        prof.enable()
+    if "tracemalloc" in modes:
+        import tracemalloc
+
+        tracemalloc.start(25)
+    try:
+        yield out
+    finally:
+        if prof is not None:
+            prof.disable()
+            out["cprofile"] = prof
+        if "tracemalloc" in modes:
+            import tracemalloc
+
+            out["tracemalloc"] = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+
+def write_profiles(captured: dict, name: str, run_stamp: str) -> list[pathlib.Path]:
+    """Write captured profiles to PROFILE_DIR as <name>-<run stamp>.*; they are never committed."""
+    written: list[pathlib.Path] = []
+    if not captured:
+        return written
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    base = PROFILE_DIR / f"{name}-{run_stamp}"
+    if "cprofile" in captured:
+        out = base.with_name(base.name + ".prof")
+        captured["cprofile"].dump_stats(str(out))
+        written.append(out)
+    if "tracemalloc" in captured:
+        snapshot, peak = captured["tracemalloc"]
+        out = base.with_name(base.name + "-tracemalloc.txt")
+        lines = [f"peak traced memory: {peak} bytes", ""]
+        lines += [str(s) for s in snapshot.statistics("lineno")[:40]]
+        out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        written.append(out)
+    return written
+
+
+# Run journal: an undo log that makes a run's state changes all-or-nothing.
+# Before a stage first touches a file, journal_touch() records how to undo it:
+# the original size for append-only logs, a hardlink to the original inode for
+# files replaced via write-temp-then-rename (atomic_write), or "create". Each
+# completed stage also checkpoints its result. The run commits by deleting
+# the journal; a journal left behind means the run died. The next run rolls
+# it back entirely, while --resume undoes only the unfinished stage and
+# continues from the checkpoints, without refetching or re-rendering.
+_JOURNAL: dict | None = None
+
+
+def _journal_save(journal: dict) -> None:
+    JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = JOURNAL_DIR / "run.json.tmp"
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(journal, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(JOURNAL_DIR / "run.json")
+
+
+def journal_load() -> dict | None:
+    try:
+        return json.loads((JOURNAL_DIR / "run.json").read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def journal_begin(run_stamp: str, command: str = "all") -> dict:
+    global _JOURNAL
+    shutil.rmtree(JOURNAL_DIR, ignore_errors=True)
+    (JOURNAL_DIR / "undo").mkdir(parents=True, exist_ok=True)
+    _JOURNAL = {"runStamp": run_stamp, "command": command, "startedAt": now_lima().isoformat(), "stage": None, "done": {}, "touched": []}
+    _journal_save(_JOURNAL)
+    return _JOURNAL
+
+
+def journal_resume(journal: dict) -> dict:
+    """Undo the stage that was interrupted and make `journal` the active one."""
+    global _JOURNAL
+    journal_rollback(journal, [journal["stage"]] if journal.get("stage") else [])
+    journal["stage"] = None
+    _JOURNAL = journal
+    _journal_save(journal)
+    return journal
+
+
+def journal_commit() -> None:
+    global _JOURNAL
+    _JOURNAL = None
+    (JOURNAL_DIR / "run.json").unlink(missing_ok=True)  # the commit point
+    shutil.rmtree(JOURNAL_DIR, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def run_lock() -> Iterator[None]:
+    """
+    Hold the checkout's run lock: stages started by separate cron entries and
+    daemon flushes share one journal, so journaled runs take turns. A journal
+    found while holding the lock was left by a run that died.
+    """
+    import fcntl
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with (CACHE_DIR / "run.lock").open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)  # released when the file closes
+        yield
+
+
+def journal_touch(path: pathlib.Path, append: bool = False) -> None:
+    """Record how to undo the active stage's first change to `path` (no-op outside a journaled stage)."""
+    journal = _JOURNAL
+    if journal is None or journal["stage"] is None:
+        return
+    key = str(path)
+    if any(e["path"] == key and e["stage"] == journal["stage"] for e in journal["touched"]):
+        return
+    entry: dict = {"stage": journal["stage"], "path": key}
+    if not path.exists():
+        entry["kind"] = "create"
+    elif append:
+        entry.update(kind="append", size=path.stat().st_size)
+    else:
+        backup = JOURNAL_DIR / "undo" / str(len(journal["touched"]))
         try:
-            items.extend(fetch_arxiv_topic(t))
+            os.link(path, backup)
+        except OSError:
+            shutil.copy2(path, backup)
+        entry.update(kind="replace", backup=backup.name)
+    journal["touched"].append(entry)
+    _journal_save(journal)
+
+
+def journal_rollback(journal: dict, stages: list[str] | None = None) -> None:
+    """Undo recorded changes, newest first; all of them, or only those made by `stages`."""
+    keep: list[dict] = []
+    for entry in reversed(journal["touched"]):
+        if stages is not None and entry["stage"] not in stages:
+            keep.append(entry)
+            continue
+        path = pathlib.Path(entry["path"])
+        if entry["kind"] == "create":
+            path.unlink(missing_ok=True)
+        elif entry["kind"] == "append":
+            if path.exists():
+                with path.open("r+b") as f:
+                    f.truncate(entry["size"])
+        else:
+            backup = JOURNAL_DIR / "undo" / entry["backup"]
+            if backup.exists():
+                os.replace(backup, path)
+    journal["touched"] = list(reversed(keep))
+    for name in list(journal["done"]) if stages is None else stages:
+        journal["done"].pop(name, None)
+
+
+def atomic_write(path: pathlib.Path, data: str | bytes) -> None:
+    """Journaled write-temp-then-rename."""
+    journal_touch(path)
+    tmp = path.with_name(path.name + ".tmp")
+    if isinstance(data, str):
+        tmp.write_text(data, encoding="utf-8")
+    else:
+        tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def run_stage(name: str, fn: Callable[[dict], dict]) -> dict:
+    """
+    Run one stage under stage() metrics. Inside a journaled run, a stage that
+    already completed returns its checkpointed (JSON) result instead.
+    """
+    journal = _JOURNAL
+    if journal is not None and name in journal["done"]:
+        return json.loads((JOURNAL_DIR / journal["done"][name]).read_text(encoding="utf-8"))
+    if journal is not None:
+        journal["stage"] = name
+        _journal_save(journal)
+    with stage(name) as m:
+        result = fn(m)
+    if journal is not None:
+        checkpoint = JOURNAL_DIR / f"stage-{name}.json"
+        checkpoint.write_text(json.dumps(result, ensure_ascii=False, default=_json_default), encoding="utf-8")
+        journal["done"][name] = checkpoint.name
+        journal["stage"] = None
+        _journal_save(journal)
+    return result
+
+
+_HTTP_LOCAL = threading.local()
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+def _http_connection(scheme: str, netloc: str, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+    """Return this thread's keep-alive connection for (scheme, netloc) and whether it was reused."""
+    import http.client
+
+    conns = getattr(_HTTP_LOCAL, "conns", None)
+    if conns is None:
+        conns = _HTTP_LOCAL.conns = {}
+    conn = conns.get((scheme, netloc))
+    reused = conn is not None and conn.sock is not None
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conns[(scheme, netloc)] = cls(netloc, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn, reused
+
+
+@contextlib.contextmanager
+def http_open(url: str, timeout: float = FETCH_TIMEOUT_S, headers: dict | None = None) -> Iterator[tuple[int, dict, http.client.HTTPResponse]]:
+    """
+    GET over a per-thread keep-alive connection, following redirects.
+    Yields (status, lower-cased headers, unread response) so callers can
+    stream the body; raises HTTPError on 4xx/5xx. Whatever the caller leaves
+    unread is drained on exit so the connection can be reused.
+    """
+    import http.client
+    import urllib.error
+
+    req_headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive", **(headers or {})}
+    for _ in range(5):
+        parts = urllib.parse.urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        conn, reused = _http_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request("GET", target, headers=req_headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # Server dropped an idle keep-alive socket; reconnect once.
+            conn.request("GET", target, headers=req_headers)
+            resp = conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        try:
+            if resp.status in _REDIRECT_STATUSES and resp_headers.get("location"):
+                resp.read()
+                url = urllib.parse.urljoin(url, resp_headers["location"])
+                continue
+            if resp.status >= 400:
+                resp.read()
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.msg, None)
+            yield resp.status, resp_headers, resp
+            resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        return
+    raise urllib.error.URLError(f"too many redirects: {url}")
+
+
+def arxiv_query_url(search_query: str, start: int = 0, max_results: int = MAX_FETCH_PER_TOPIC) -> str:
+    query = urllib.parse.quote(search_query)
+    return (
+        f"{ARXIV_API_URL}?"
+        f"search_query={query}&start={start}&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
+    )
+
+
+_HTTP_CACHE_LOCK = threading.Lock()
+_HTTP_CACHE: dict | None = None
+
+
+def _http_cache_index() -> dict:
+    """In-memory view of the cache index, loaded once per process. Caller holds the lock."""
+    global _HTTP_CACHE
+    if _HTTP_CACHE is None:
+        index_file = HTTP_CACHE_DIR / "index.json"
+        try:
+            _HTTP_CACHE = json.loads(index_file.read_text(encoding="utf-8"))
         except Exception:
+            _HTTP_CACHE = {}
+    return _HTTP_CACHE
+
+
+def http_cache_lookup(url: str) -> tuple[dict, list[dict]] | None:
+    """Return (meta, parsed entries) cached for `url`, or None."""
+    with _HTTP_CACHE_LOCK:
+        meta = _http_cache_index().get(url)
+        if not meta:
+            return None
+        meta = dict(meta)
+    try:
+        entries = json.loads((HTTP_CACHE_DIR / f"{meta['key']}.json").read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return meta, entries
+
+
+def http_cache_touch(url: str, revalidated: bool = False) -> None:
+    """Mark an entry as recently used; a 304 also restarts its TTL."""
+    now = time.time()
+    with _HTTP_CACHE_LOCK:
+        meta = _http_cache_index().get(url)
+        if meta:
+            meta["lastUsed"] = now
+            if revalidated:
+                meta["fetchedAt"] = now
+
+
+def http_cache_store(url: str, entries: list[dict], headers: dict) -> None:
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    payload = json.dumps(entries, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    tmp = HTTP_CACHE_DIR / f"{key}.json.tmp{threading.get_ident()}"
+    tmp.write_text(payload, encoding="utf-8")
+    tmp.replace(HTTP_CACHE_DIR / f"{key}.json")
+    now = time.time()
+    with _HTTP_CACHE_LOCK:
+        index = _http_cache_index()
+        index[url] = {
+            "key": key,
+            "etag": headers.get("etag", ""),
+            "lastModified": headers.get("last-modified", ""),
+            "fetchedAt": now,
+            "lastUsed": now,
+            "size": len(payload.encode("utf-8")),
+        }
+        # Size-bounded LRU: drop least recently used entries until under budget.
+        total = sum(m.get("size", 0) for m in index.values())
+        while total > HTTP_CACHE_MAX_BYTES and len(index) > 1:
+            victim = min((u for u in index if u != url), key=lambda u: index[u].get("lastUsed", 0))
+            gone = index.pop(victim)
+            total -= gone.get("size", 0)
+            (HTTP_CACHE_DIR / f"{gone['key']}.json").unlink(missing_ok=True)
+
+
+def http_cache_flush() -> None:
+    with _HTTP_CACHE_LOCK:
+        if _HTTP_CACHE is None:
+            return
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = HTTP_CACHE_DIR / "index.json.tmp"
+        tmp.write_text(json.dumps(_HTTP_CACHE, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(HTTP_CACHE_DIR / "index.json")
+
+
+def fetch_arxiv_topic(topic: str, max_results: int | None = None, timeout: float = FETCH_TIMEOUT_S) -> list[dict]:
+    """
+    Fetch and parse one topic query. Responses are cached as parsed entries:
+    within HTTP_CACHE_TTL_S no request is made, afterwards the request is
+    conditional and a 304 reuses the cached entries without parsing XML.
+    """
+    url = arxiv_query_url(f"all:{topic}", max_results=max_results or MAX_FETCH_PER_TOPIC)
+    return _fetch_arxiv_cached(url, topic, lambda body: list(iter_arxiv_entries(body, topic)), timeout)
+
+
+def arxiv_batch_query(topics: list[str]) -> str:
+    """One search_query matching any of `topics` (all words of a topic must match)."""
+    return " OR ".join("(" + " AND ".join(f"all:{w}" for w in t.split()) + ")" for t in topics)
+
+
+_ARXIV_GATE = threading.Lock()
+_ARXIV_LAST_REQUEST = 0.0
+
+
+def _arxiv_polite_wait() -> None:
+    """Space batched queries ARXIV_POLITE_DELAY_S apart across all threads."""
+    global _ARXIV_LAST_REQUEST
+    with _ARXIV_GATE:
+        wait = _ARXIV_LAST_REQUEST + ARXIV_POLITE_DELAY_S - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _ARXIV_LAST_REQUEST = time.monotonic()
+
+
+def fetch_arxiv_batch(topics: list[str], timeout: float = FETCH_TIMEOUT_S) -> list[dict]:
+    """
+    Fetch several topics with one ORed query (MAX_FETCH_PER_TOPIC results
+    per topic, newest first across the batch) and tag each entry with the
+    topics it matches locally. Cached like fetch_arxiv_topic().
+    """
+    if len(topics) == 1:
+        return fetch_arxiv_topic(topics[0], timeout=timeout)
+    url = arxiv_query_url(arxiv_batch_query(topics), max_results=MAX_FETCH_PER_TOPIC * len(topics))
+
+    def parse(body: io.BufferedIOBase) -> list[dict]:
+        return [attribute_topics(item, topics) for item in iter_arxiv_entries(body, "")]
+
+    return _fetch_arxiv_cached(url, " | ".join(topics), parse, timeout, polite=True)
+
+
+def _fetch_arxiv_cached(
+    url: str,
+    label: str,
+    parse: Callable[[io.BufferedIOBase], list[dict]],
+    timeout: float,
+    polite: bool = False,
+) -> list[dict]:
+    """GET an arXiv query through the HTTP cache; `label` names it in the run metrics."""
+    import urllib.error
+
+    cached = http_cache_lookup(url)
+    headers: dict = {}
+    if cached:
+        meta, entries = cached
+        if time.time() - meta.get("fetchedAt", 0) < HTTP_CACHE_TTL_S:
+            http_cache_touch(url)
+            record_http(label, 0, 0.0, 0, "hit")
+            return [Item(e) for e in entries]
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("lastModified"):
+            headers["If-Modified-Since"] = meta["lastModified"]
+
+    if polite:
+        _arxiv_polite_wait()
+    t0 = time.perf_counter()
+    try:
+        with http_open(url, timeout=timeout, headers=headers) as (status, resp_headers, resp):
+            if status == 304 and cached:
+                http_cache_touch(url, revalidated=True)
+                record_http(label, status, time.perf_counter() - t0, 0, "revalidated")
+                return [Item(e) for e in cached[1]]
+            body = _CountingReader(resp)
+            out = parse(body)
+    except urllib.error.HTTPError as exc:
+        record_http(label, exc.code, time.perf_counter() - t0, 0, "miss")
+        raise
+    record_http(label, status, time.perf_counter() - t0, body.nbytes, "miss")
+
+    http_cache_store(url, out, resp_headers)
+    return out
+
+
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+
+
+def _atom_entry_to_item(e: ET.Element, topic: str) -> Item | None:
+    ns = ATOM_NS
+    title = strip_html_text(e.findtext("atom:title", default="", namespaces=ns))
+    summary = strip_html_text(e.findtext("atom:summary", default="", namespaces=ns))
+    paper_id = e.findtext("atom:id", default="", namespaces=ns).strip()
+    published = e.findtext("atom:published", default="", namespaces=ns).strip()
+    links = [ln.get("href", "") for ln in e.findall("atom:link", ns)]
+    pdf = next((x for x in links if x.endswith(".pdf")), "")
+    authors = [strip_html_text(a.findtext("atom:name", default="", namespaces=ns)) for a in e.findall("atom:author", ns)]
+    if not paper_id or not title:
+        return None
+    return Item(
+        {
+            "id": paper_id,
+            "title": title,
+            "summary": summary,
+            "published": published,
+            "authors": [a for a in authors if a],
+            "pdf": pdf,
+            "topic": topic,
+            "topics": [topic] if topic else [],
+            "source": "arXiv",
+        }
+    )
+
+
+def iter_arxiv_entries(stream: io.BufferedIOBase, topic: str) -> Iterator[Item]:
+    """Incrementally parse an Atom feed, yielding items as entries complete and freeing them."""
+    import xml.etree.ElementTree as ET
+
+    root = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end" or elem.tag != _ATOM_ENTRY:
             continue
-    dedup = {x["id"]: x for x in items}
-    return sorted(dedup.values(), key=lambda x: x.get("published", ""), reverse=True)
+        item = _atom_entry_to_item(elem, topic)
+        root.clear()
+        if item:
+            yield item
+
+
+def backfill_arxiv_topic(
+    topic: str,
+    since: str = "",
+    known: Callable[[str], bool] | None = None,
+    start: int = 0,
+    page_size: int = BACKFILL_PAGE_SIZE,
+) -> Iterator[dict]:
+    """
+    Page through a topic newest-first with start=, yielding one entry at a
+    time. Stops at the first entry published before `since` (ISO prefix),
+    the first id `known` reports as already seen, or the end of results.
+    Only one page is in flight, so memory stays bounded however deep it goes.
+    """
+    while True:
+        url = arxiv_query_url(f"all:{topic}", start=start, max_results=page_size)
+        seen = 0
+        with http_open(url, timeout=FETCH_TIMEOUT_S) as (_, _, resp):
+            for item in iter_arxiv_entries(resp, topic):
+                seen += 1
+                if since and item.get("published", "") < since:
+                    return
+                if known and known(item["id"]):
+                    return
+                yield item
+        if seen < page_size:
+            return
+        start += page_size
+        time.sleep(ARXIV_POLITE_DELAY_S)
+
+
+def fetch_topics_with_retry(topics: list[str], deadline: float) -> list[dict] | None:
+    """
+    Fetch one batch of topics, retrying with exponential backoff until
+    `deadline` (time.monotonic()). None when the deadline passed before the
+    first attempt; otherwise the last error is raised once retries run out.
+    """
+    import urllib.error
+
+    last_exc: Exception | None = None
+    for attempt in range(FETCH_RETRIES):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            return fetch_arxiv_batch(topics, timeout=min(FETCH_TIMEOUT_S, remaining))
+        except urllib.error.HTTPError as exc:
+            last_exc = exc
+            if exc.code < 500 and exc.code != 429:
+                break
+        except Exception as exc:
+            last_exc = exc
+        delay = FETCH_BACKOFF_S * (2 ** attempt) * random.uniform(0.75, 1.25)
+        if time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+    if last_exc is None:
+        return None
+    raise last_exc
 
 
-def integrate_new_items(discovered: list[dict], state: dict) -> tuple[list[dict], dict]:
-    known = {x.get("id") for x in state.get("items", [])}
+# Streaming stages. A run is fetch -> parse -> screen -> persist -> render:
+# iter_discovery() yields each batch as soon as it is downloaded and parsed
+# (parsing happens while the response streams in), so callers screen early
+# batches against the feed and dedup index while later ones are still in
+# flight. In-flight work is bounded by the worker count, and buffered() puts
+# a bounded queue behind a single producer, such as backfill paging, so the
+# producer blocks when the consumer falls behind. Only the order-sensitive
+# steps wait for the end of the stream: collating versions newest-first,
+# choosing what to admit, and rendering cards.
+_STREAM_DONE = object()
+
+
+def buffered(source: Iterable, maxsize: int, name: str = "stream") -> Iterator:
+    """
+    Iterate `source` in a background thread at most `maxsize` items ahead of
+    the consumer. Producer exceptions are re-raised in the consumer; closing
+    the iterator early stops the producer.
+    """
+    q: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        it = iter(source)
+        end: tuple = (_STREAM_DONE, None)
+        try:
+            for x in it:
+                if not put((x, None)):
+                    break
+        except BaseException as exc:
+            end = (_STREAM_DONE, exc)
+        finally:
+            close = getattr(it, "close", None)
+            if close:
+                close()
+        put(end)
+
+    threading.Thread(target=produce, name=name, daemon=True).start()
+    try:
+        while True:
+            x, exc = q.get()
+            if x is _STREAM_DONE:
+                if exc is not None:
+                    raise exc
+                return
+            yield x
+    finally:
+        stop.set()
+
+
+def iter_discovery(
+    topics: list[str] | None = None,
+    workers: int = DISCOVERY_WORKERS,
+    deadline_s: float = DISCOVERY_DEADLINE_S,
+    pool: concurrent.futures.ThreadPoolExecutor | None = None,
+    batch: int = DISCOVERY_BATCH_TOPICS,
+    report: dict | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Fetch all topics under one overall deadline, yielding each batch's items
+    as it completes. Topics are ORed into queries of up to `batch` topics
+    (DISCOVERY_BATCH_TOPICS), spaced ARXIV_POLITE_DELAY_S apart, so a run
+    costs a few round trips instead of one per topic while the queries still
+    run concurrently and early batches are screened as later ones download;
+    batch=1 fetches every topic concurrently on its own.
+
+    `report` is filled in with the topics that succeeded, failed (with the
+    error) or did not finish before the deadline; timedOut is set once the
+    stream ends. A caller-owned `pool` (daemon mode) is left running, which
+    keeps its threads' keep-alive connections warm, and the HTTP cache index
+    is left for the caller to flush.
+    """
+    import concurrent.futures
+
+    topics = list(TOPICS if topics is None else topics)
+    if report is None:
+        report = {}
+    report.update(ok=[], failed={}, timedOut=[])
+    deadline = time.monotonic() + deadline_s
+
+    owned = pool is None
+    if pool is None:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="arxiv")
+    size = max(1, batch)
+    chunks = [topics[i : i + size] for i in range(0, len(topics), size)]
+    futures = {pool.submit(fetch_topics_with_retry, chunk, deadline): chunk for chunk in chunks}
+    try:
+        for fut in concurrent.futures.as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            chunk = futures[fut]
+            try:
+                items = fut.result()
+            except Exception as exc:
+                for topic in chunk:
+                    report["failed"][topic] = f"{type(exc).__name__}: {exc}"
+                continue
+            if items is None:
+                continue  # never attempted before the deadline: reported as timed out
+            report["ok"].extend(chunk)
+            yield items
+    except concurrent.futures.TimeoutError:
+        pass
+    finally:
+        # In-flight requests are already bounded by the deadline; queued ones are dropped.
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
+            http_cache_flush()
+        else:
+            for fut in futures:
+                fut.cancel()
+        report["timedOut"] = [t for t in topics if t not in report["ok"] and t not in report["failed"]]
+
+
+def collate_discovered(items: Iterable[dict]) -> list[dict]:
+    """Highest version of each paper, with every topic it was found under, newest first."""
+    latest: dict[str, dict] = {}
+    for x in items:
+        key = canonical_paper_id(x["id"])
+        seen = latest.get(key)
+        if seen is None or paper_version(x["id"]) > paper_version(seen["id"]):
+            latest[key] = x
+        elif seen["id"] == x["id"]:
+            # Same paper returned by two queries: keep every topic it was found under.
+            tags = seen.get("topics") or [seen.get("topic", "")]
+            extra = [t for t in x.get("topics") or [x.get("topic", "")] if t not in tags]
+            if extra:
+                merged = as_item(seen).copy()
+                merged["topics"] = tags + extra
+                latest[key] = merged
+    # Ties broken by id, so the order does not depend on which batch finished first.
+    return sorted(latest.values(), key=lambda x: (x.get("published", ""), x["id"]), reverse=True)
+
+
+def discover_arxiv(
+    topics: list[str] | None = None,
+    workers: int = DISCOVERY_WORKERS,
+    deadline_s: float = DISCOVERY_DEADLINE_S,
+    pool: concurrent.futures.ThreadPoolExecutor | None = None,
+    batch: int = DISCOVERY_BATCH_TOPICS,
+) -> tuple[list[dict], dict]:
+    """Run iter_discovery() to completion; returns (items newest first, report)."""
+    report: dict = {}
+    batches = iter_discovery(topics, workers, deadline_s, pool, batch, report)
+    return collate_discovered(it for items in batches for it in items), report
+
+
+# Evidence index: BM25 inverted index over every item in the feed store, in
+# admission order. docs[i] = [paper id, token count]; postings map each term
+# to a flat [doc index, term frequency, doc index, term frequency, ...] list.
+# It lives in the cache directory as a base file, written at compaction, plus
+# a delta log with one [doc index, paper id, token count, {term: tf}] line per
+# document added since. A save appends to the log; once BM25_COMPACT_DOCS
+# documents sit in it, the base is rewritten and the log dropped. The index
+# catches up with the feed log on open, so only new items are tokenized.
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was we were which with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _bm25_doc_tokens(item: dict) -> list[str]:
+    # Title counted twice: it is the densest statement of what a paper is about.
+    return tokenize(f"{item.get('title','')} {item.get('title','')} {item.get('summary','')} {item.get('topic','')}")
+
+
+def _bm25_empty() -> dict:
+    return {"docs": [], "totalLen": 0, "postings": {}}
+
+
+def _bm25_index_doc(index: dict, paper_id: str, length: int, counts: dict[str, int]) -> None:
+    doc = len(index["docs"])
+    index["docs"].append([paper_id, length])
+    index["totalLen"] += length
+    postings = index["postings"]
+    for tok, tf in counts.items():
+        plist = postings.get(tok)
+        if plist is None:
+            postings[tok] = [doc, tf]
+        else:
+            plist += (doc, tf)
+
+
+def bm25_add(index: dict, items: list[dict]) -> None:
+    """Index items (in admission order)."""
+    for it in items:
+        tokens = _bm25_doc_tokens(it)
+        counts: dict[str, int] = {}
+        for tok in tokens:
+            counts[tok] = counts.get(tok, 0) + 1
+        index["pending"].append([len(index["docs"]), it.get("id", ""), len(tokens), counts])
+        _bm25_index_doc(index, it.get("id", ""), len(tokens), counts)
+    if items:
+        index["dirty"] = True
+
+
+def open_bm25_index(store: dict) -> dict:
+    try:
+        index = json.loads(BM25_INDEX_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        index = _bm25_empty()
+    base = len(index["docs"])
+    try:
+        with BM25_DELTA_FILE.open("rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    raise ValueError("torn delta line")
+                doc, paper_id, length, counts = json.loads(raw)
+                if doc > len(index["docs"]):
+                    raise ValueError("gap in delta log")
+                if doc == len(index["docs"]):  # lines the base already holds are skipped
+                    _bm25_index_doc(index, paper_id, length, counts)
+    except OSError:
+        pass
+    except ValueError:
+        base = -1  # torn or unplaceable tail: the next save compacts it away
+    rows = store["rows"]
+    n = len(index["docs"])
+    if n > len(rows) or (n and index["docs"][-1][0] != rows[n - 1][4]):
+        # Index is ahead of or diverged from the feed log: rebuild.
+        index, n, base = _bm25_empty(), 0, -1
+    index.update(base=base, pending=[], dirty=False)
+    if n < len(rows):
+        missing = rows[n:]
+        for i in range(0, len(missing), 500):
+            bm25_add(index, feed_read([row[0] for row in missing[i : i + 500]], full=True))
+    return index
+
+
+def save_bm25_index(index: dict) -> None:
+    if not index.get("dirty"):
+        return
+    BM25_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    if index["base"] < 0 or len(index["docs"]) - index["base"] >= BM25_COMPACT_DOCS:
+        data = {k: index[k] for k in ("docs", "totalLen", "postings")}
+        atomic_write(BM25_INDEX_FILE, json.dumps(data, separators=(",", ":")))
+        if BM25_DELTA_FILE.exists():
+            journal_touch(BM25_DELTA_FILE)
+            BM25_DELTA_FILE.unlink()
+        index["base"] = len(index["docs"])
+    else:
+        journal_touch(BM25_DELTA_FILE, append=True)
+        with BM25_DELTA_FILE.open("a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n" for line in index["pending"]))
+    index["pending"] = []
+    index["dirty"] = False
+
+
+def bm25_top_k(index: dict, query: str, k: int = EVIDENCE_TOP_K) -> list[tuple[str, float]]:
+    """Top-k (paper id, score) for `query`; touches only the postings of its terms."""
+    docs = index["docs"]
+    n = len(docs)
+    if not n:
+        return []
+    avgdl = index["totalLen"] / n or 1.0
+    scores: dict[int, float] = {}
+    for term in set(tokenize(query)):
+        plist = index["postings"].get(term)
+        if not plist:
+            continue
+        df = len(plist) // 2
+        idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        for doc, tf in zip(plist[::2], plist[1::2]):
+            norm = tf + BM25_K1 * (1.0 - BM25_B + BM25_B * docs[doc][1] / avgdl)
+            scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1.0) / norm
+    best = heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+    return [(docs[doc][0], score) for doc, score in best]
+
+
+def bm25_doc_score(index: dict, item: dict, terms: set[str]) -> float:
+    """BM25 score of one item for query `terms`, using the index's collection statistics."""
+    docs = index["docs"]
+    n = len(docs)
+    if not n:
+        return 0.0
+    avgdl = index["totalLen"] / n or 1.0
+    tokens = _bm25_doc_tokens(item)
+    counts: dict[str, int] = {}
+    for tok in tokens:
+        if tok in terms:
+            counts[tok] = counts.get(tok, 0) + 1
+    score = 0.0
+    for term, tf in counts.items():
+        df = len(index["postings"].get(term, ())) // 2 or 1
+        idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        norm = tf + BM25_K1 * (1.0 - BM25_B + BM25_B * len(tokens) / avgdl)
+        score += idf * tf * (BM25_K1 + 1.0) / norm
+    return score
+
+
+# Near-duplicate index: papers are keyed by their version-less arXiv id, and
+# title + summary get a 64-bit SimHash over the set of their tokens. Signatures
+# within SIMHASH_MAX_DISTANCE bits agree exactly on at least one of the
+# SIMHASH_BANDS bands, so a lookup only compares against that band's buckets.
+# docs[i] = [canonical id, signature or null] in admission order; it is
+# persisted and caught up like the BM25 index, and the band tables are rebuilt
+# from docs on open.
+_ARXIV_ID_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$")
+_VERSION_RE = re.compile(r"v(\d+)(?:\.pdf)?$")
+_SIMHASH_TOKEN_LANES: dict[str, int] = {}
+
+
+def canonical_paper_id(paper_id: str) -> str:
+    """'http://arxiv.org/abs/2502.01234v3' -> 'arxiv:2502.01234'; other ids unchanged."""
+    m = _ARXIV_ID_RE.search(paper_id)
+    return f"arxiv:{m.group(1)}" if m else paper_id
+
+
+def paper_version(paper_id: str) -> int:
+    m = _VERSION_RE.search(paper_id)
+    return int(m.group(1)) if m else 0
+
+
+def simhash(item: dict) -> int | None:
+    tokens = set(tokenize(f"{item.get('title','')} {item.get('summary','')}"))
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+    lanes = 0
+    for tok in tokens:
+        spread = _SIMHASH_TOKEN_LANES.get(tok)
+        if spread is None:
+            h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "big")
+            spread = _SIMHASH_TOKEN_LANES[tok] = sum(1 << (16 * b) for b in range(64) if h >> b & 1)
+        # Hash bits are spread into 16-bit lanes, so one addition counts every bit position.
+        lanes += spread
+    half = len(tokens) // 2
+    return sum(1 << b for b in range(64) if (lanes >> (16 * b)) & 0xFFFF > half)
+
+
+def _simhash_bands(sig: int) -> list[int]:
+    width = 64 // SIMHASH_BANDS
+    return [(sig >> (band * width)) & ((1 << width) - 1) for band in range(SIMHASH_BANDS)]
+
+
+def _dedup_insert(index: dict, canonical: str, sig: int | None) -> None:
+    doc = len(index["docs"])
+    index["docs"].append([canonical, sig])
+    index["canon"].setdefault(canonical, doc)
+    if sig is not None:
+        for table, key in zip(index["bands"], _simhash_bands(sig)):
+            table.setdefault(key, []).append(doc)
+
+
+def dedup_add(index: dict, items: list[dict]) -> None:
+    """Index items (in admission order)."""
+    for it in items:
+        _dedup_insert(index, canonical_paper_id(it.get("id", "")), simhash(it))
+    if items:
+        index["dirty"] = True
+
+
+def dedup_match(index: dict, item: dict) -> str | None:
+    """Id of an indexed paper that `item` is a version or near-duplicate of, if any."""
+    canonical = canonical_paper_id(item.get("id", ""))
+    if canonical in index["canon"]:
+        return canonical
+    return _dedup_near(index, simhash(item))
+
+
+def _dedup_near(index: dict, sig: int | None) -> str | None:
+    if sig is None:
+        return None
+    docs = index["docs"]
+    for table, key in zip(index["bands"], _simhash_bands(sig)):
+        for doc in table.get(key, ()):
+            if (docs[doc][1] ^ sig).bit_count() <= SIMHASH_MAX_DISTANCE:
+                return docs[doc][0]
+    return None
+
+
+def open_dedup_index(store: dict) -> dict:
+    try:
+        docs = json.loads(DEDUP_INDEX_FILE.read_text(encoding="utf-8"))["docs"]
+    except Exception:
+        docs = []
+    rows = store["rows"]
+    n = len(docs)
+    if n > len(rows) or (n and docs[-1][0] != canonical_paper_id(rows[n - 1][4])):
+        # Index is ahead of or diverged from the feed log: rebuild.
+        docs, n = [], 0
+    index: dict = {"docs": [], "canon": {}, "bands": [{} for _ in range(SIMHASH_BANDS)], "dirty": False}
+    for canonical, sig in docs:
+        _dedup_insert(index, canonical, sig)
+    if n < len(rows):
+        missing = rows[n:]
+        for i in range(0, len(missing), 500):
+            dedup_add(index, feed_read([row[0] for row in missing[i : i + 500]], full=True))
+    return index
+
+
+def save_dedup_index(index: dict) -> None:
+    if not index.get("dirty"):
+        return
+    DEDUP_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(DEDUP_INDEX_FILE, json.dumps({"docs": index["docs"]}, separators=(",", ":")))
+    index["dirty"] = False
+
+
+def screen_item(item: dict, dedup: dict) -> tuple[str, int | None] | None:
+    """None when `item` is a version or near-duplicate of an indexed paper, else its (canonical id, SimHash)."""
+    canonical = canonical_paper_id(item["id"])
+    if canonical in dedup["canon"]:
+        return None
+    sig = simhash(item)
+    return None if _dedup_near(dedup, sig) is not None else (canonical, sig)
+
+
+def screen_stream(batches: Iterable[list[dict]], store: dict, dedup: dict, screened: dict) -> Iterator[dict]:
+    """
+    Pass discovered items through, screening each id not yet in the feed on
+    the way: screened[id] gets its screen_item() verdict, and its keyword
+    mask is cached for thread and relevance scoring.
+    """
+    for items in batches:
+        for it in items:
+            pid = it["id"]
+            if pid not in screened and not feed_has(store, pid):
+                screened[pid] = screen_item(it, dedup)
+                item_keyword_mask(it)
+            yield it
+
+
+def integrate_new_items(
+    discovered: list[dict],
+    store: dict,
+    index: dict | None = None,
+    dedup: dict | None = None,
+    threads: dict | None = None,
+    screened: dict | None = None,
+) -> list[dict]:
+    """
+    Admit up to MAX_NEW_PER_RUN never-seen items into the feed store; returns
+    them newest first. With a `dedup` index, new versions and near-duplicates
+    of papers already in the feed (or earlier in this batch) are skipped too;
+    verdicts already computed by screen_stream() are taken from `screened`.
+    With thread state (`threads`), admitted items update the thread counters.
+    """
     new: list[dict] = []
+    batch: list[tuple[str, int | None]] = []
     run_ts = now_lima().isoformat()
     for item in discovered:
-        if item["id"] in known:
+        if feed_has(store, item["id"]):
             continue
-        x = dict(item)
+        if dedup is not None:
+            verdict = screened.get(item["id"], _MISSING) if screened is not None else _MISSING
+            if verdict is _MISSING:
+                verdict = screen_item(item, dedup)
+            if verdict is None:
+                count_metric("dedupSkipped")
+                continue
+            canonical, sig = verdict
+            if any(
+                canonical == c or (sig is not None and s is not None and (sig ^ s).bit_count() <= SIMHASH_MAX_DISTANCE)
+                for c, s in batch
+            ):
+                count_metric("dedupSkipped")
+                continue
+            batch.append((canonical, sig))
+        x = as_item(item).copy()
         x["addedAt"] = run_ts
         x["kind"] = "paper"
         x["status"] = "discovered"
         new.append(x)
         if len(new) >= MAX_NEW_PER_RUN:
             break
-    state["items"] = (new + state.get("items", []))[:400]
-    return new, state
+    # Index while the summaries are still in memory; appending spills them to the log.
+    if index is not None:
+        bm25_add(index, list(reversed(new)))
+    if dedup is not None and batch:
+        for canonical, sig in reversed(batch):
+            _dedup_insert(dedup, canonical, sig)
+        dedup["dirty"] = True
+    if threads is not None:
+        observe_thread_evidence(threads, new, index)
+    feed_append(store, list(reversed(new)))
+    return new
+
+
+SNAPSHOT_FORMAT = "cohera-snapshot/1"
+
+
+def source_object_path(digest: str) -> pathlib.Path:
+    return SOURCE_OBJECTS_DIR / digest[:2] / f"{digest}.json.gz"
+
+
+def store_source_object(item: Item | dict) -> str:
+    """Store one normalized item under its content hash (written once, gzip with fixed mtime)."""
+    record = item.to_dict() if isinstance(item, Item) else item
+    payload = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    out = source_object_path(digest)
+    if not out.exists():
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+        tmp.replace(out)
+    return digest
 
 
 def write_sources_snapshot(discovered: list[dict]) -> pathlib.Path:
+    """
+    Write this run's snapshot as a small manifest of item hashes.
+    Item bodies live once each in SOURCE_OBJECTS_DIR, so repeated runs over
+    the same papers only add a manifest.
+    """
     stamp = now_lima().strftime("%Y-%m-%d_%H%M%S")
     out = SOURCES_DIR / f"{stamp}.json"
-    out.write_text(json.dumps(discovered, ensure_ascii=False, indent=2), encoding="utf-8")
+    hashes = []
+    for it in discovered:
+        hashes.append(store_source_object(it))
+        if isinstance(it, Item):
+            it.spill(("object", hashes[-1]))
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "createdAt": now_lima().isoformat(),
+        "count": len(hashes),
+        "setHash": hashlib.sha256("".join(sorted(hashes)).encode("ascii")).hexdigest(),
+        "items": hashes,
+    }
+    atomic_write(out, json.dumps(manifest, indent=1) + "\n")
     return out
 
 
+def iter_sources_snapshot(path: pathlib.Path, cache: dict[str, Item] | None = None) -> Iterator[Item]:
+    """
+    Stream a snapshot's items one object at a time, as Items whose summary
+    stays in the object store. `cache` (digest -> Item) lets a sequence of
+    snapshots decode each shared object once.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        yield from (Item(rec) for rec in data)
+        return
+    for digest in data.get("items", []):
+        item = cache.get(digest) if cache is not None else None
+        if item is None:
+            item = Item(json.loads(gzip.decompress(source_object_path(digest).read_bytes())), ("object", digest))
+            if cache is not None:
+                cache[digest] = item
+        yield item.copy()
+
+
+def snapshot_time(path: pathlib.Path) -> dt.datetime:
+    """When a snapshot was taken, from its YYYY-MM-DD_HHMMSS name (Lima time)."""
+    try:
+        return dt.datetime.strptime(path.stem, "%Y-%m-%d_%H%M%S").replace(tzinfo=TZ)
+    except ValueError:
+        return dt.datetime.fromtimestamp(path.stat().st_mtime, TZ)
+
+
 def citation_line(item: dict) -> str:
     authors = ", ".join(item.get("authors", [])[:4])
     if len(item.get("authors", [])) > 4:
@@ -156,24 +1700,95 @@ def citation_line(item: dict) -> str:
     return f"{authors} ({item.get('published','')[:10]}). {item.get('title','')}. arXiv. {item.get('id','')}"
 
 
+# Digests: one markdown file per day, and every run appends its own section
+# ("## Run HH:MM:SS") instead of rewriting the file, so earlier runs' papers
+# stay and a run costs only the bytes it adds. Sections and papers carry
+# <a id> anchors; a later run in the same second gets "run-HHMMSS-2" and so
+# on, so anchors stay unique within the file. DIGEST_INDEX_FILE is an append-only TSV with one line per
+# listed paper (canonical id, digest path relative to ROOT, anchor), so
+# cards and search can link straight to a paper's entry.
+_DIGEST_INDEX: dict | None = None
+
+
+def digest_anchor(section: str, paper_id: str) -> str:
+    return f"{section}-{slugify(canonical_paper_id(paper_id))}"
+
+
+def load_digest_index() -> dict[str, str]:
+    """Canonical paper id -> "<digest path>#<anchor>"; reads only what was appended since the last call."""
+    global _DIGEST_INDEX
+    if _DIGEST_INDEX is None:
+        _DIGEST_INDEX = {"size": 0, "map": {}}
+    try:
+        size = DIGEST_INDEX_FILE.stat().st_size
+    except OSError:
+        size = 0
+    if size < _DIGEST_INDEX["size"]:
+        _DIGEST_INDEX = {"size": 0, "map": {}}  # truncated (rolled back): reread
+    if size > _DIGEST_INDEX["size"]:
+        with DIGEST_INDEX_FILE.open("rb") as f:
+            f.seek(_DIGEST_INDEX["size"])
+            data = f.read(size - _DIGEST_INDEX["size"])
+        complete = data[: data.rfind(b"\n") + 1]  # a torn final line is read once it is complete
+        for line in complete.decode("utf-8").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 3:
+                _DIGEST_INDEX["map"][parts[0]] = f"{parts[1]}#{parts[2]}"
+        _DIGEST_INDEX["size"] += len(complete)
+    return _DIGEST_INDEX["map"]
+
+
+def digest_location(paper_id: str) -> str | None:
+    """Where a paper's digest entry is ("research/digests/<day>-arxiv-digest.md#<anchor>"), if any digest listed it."""
+    return load_digest_index().get(canonical_paper_id(paper_id))
+
+
+def _append_text(path: pathlib.Path, text: str) -> None:
+    """Journaled append; starts a new line if the file does not end with one."""
+    journal_touch(path, append=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        end = f.tell()
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                text = "\n" + text
+        f.write(text.encode("utf-8"))
+
+
 def write_digest(new_items: list[dict], source_file: pathlib.Path) -> pathlib.Path:
-    out = DIGESTS_DIR / f"{now_lima().strftime('%Y-%m-%d')}-arxiv-digest.md"
-    lines = [
-        f"# Cohera Research Digest — {now_lima().strftime('%Y-%m-%d %H:%M')} (Lima)",
+    """Append this run's section to today's digest and its papers to the digest index."""
+    now = now_lima()
+    out = DIGESTS_DIR / f"{now.strftime('%Y-%m-%d')}-arxiv-digest.md"
+    rel = out.relative_to(ROOT).as_posix()
+    heading = f"## Run {now.strftime('%H:%M:%S')} (Lima)"
+    section = f"run-{now.strftime('%H%M%S')}"
+    if out.exists():
+        same_second = out.read_text(encoding="utf-8").count(heading + "\n")
+        if same_second:
+            section += f"-{same_second + 1}"
+        lines = []
+    else:
+        lines = [f"# Cohera Research Digest — {now.strftime('%Y-%m-%d')} (Lima)", ""]
+    lines += [
+        heading,
+        f'<a id="{section}"></a>',
         "",
         f"Source snapshot: `{source_file.relative_to(ROOT)}`",
         "",
-        "## New discoveries",
-        "",
     ]
+    index_lines: list[str] = []
     if not new_items:
-        lines.append("No new unique papers discovered in this run.")
+        lines += ["No new unique papers discovered in this run.", ""]
     else:
         for i, it in enumerate(new_items, 1):
+            anchor = digest_anchor(section, it.get("id", ""))
             lines.extend(
                 [
                     f"### {i}. {it['title']}",
-                    f"- Topic: {it.get('topic','')}",
+                    f'<a id="{anchor}"></a>',
+                    "",
+                    f"- Topic: {', '.join(it.get('topics') or [it.get('topic','')])}",
                     f"- Published: {it.get('published','')[:10]}",
                     f"- URL: {it.get('id','')}",
                     f"- PDF: {it.get('pdf','') or 'n/a'}",
@@ -182,12 +1797,24 @@ def write_digest(new_items: list[dict], source_file: pathlib.Path) -> pathlib.Pa
                     "",
                 ]
             )
-    out.write_text("\n".join(lines).strip() + "\n", encoding="utf-8")
+            index_lines.append(f"{_index_field(canonical_paper_id(it.get('id', '')))}\t{rel}\t{anchor}\n")
+    _append_text(out, "\n".join(lines) + "\n")
+    if index_lines:
+        _append_text(DIGEST_INDEX_FILE, "".join(index_lines))
     return out
 
 
 def write_synthesis_brief(items: list[dict]) -> pathlib.Path:
+    """
+    Rewrite synthesis-latest.md with this run's priority candidates, each
+    linked to its digest entry. A run with nothing new leaves the previous
+    brief in place; the digests keep every run's papers.
+    """
+    import textwrap
+
     out = RESEARCH / "synthesis-latest.md"
+    if not items and out.exists():
+        return out
     lines = [
         f"# Cohera Synthesis Brief — {now_lima().strftime('%Y-%m-%d %H:%M')} (Lima)",
         "",
@@ -206,11 +1833,16 @@ def write_synthesis_brief(items: list[dict]) -> pathlib.Path:
                     f"  - Citation: {citation_line(it)}",
                 ]
             )
-    out.write_text("\n".join(lines).strip() + "\n", encoding="utf-8")
+            loc = digest_location(it.get("id", ""))
+            if loc:
+                lines.append(f"  - Digest entry: [{loc}]({posixpath.relpath(loc, RESEARCH.relative_to(ROOT).as_posix())})")
+    atomic_write(out, "\n".join(lines).strip() + "\n")
     return out
 
 
 def render_card(date_str: str, tag: str, title: str, body: str, link: str | None = None) -> str:
+    import html
+
     date_str = html.escape(date_str)
     tag = html.escape(tag)
     title = html.escape(title)
@@ -227,36 +1859,191 @@ def render_card(date_str: str, tag: str, title: str, body: str, link: str | None
                 </div>"""
 
 
-def find_grid_div_bounds(text: str, grid_class_snippet: str) -> tuple[int, int] | None:
-    """Return [start, end) bounds for the first <div class="...grid..."> block."""
-    open_pat = re.compile(rf'<div\s+class="[^"]*{re.escape(grid_class_snippet)}[^"]*">')
-    m = open_pat.search(text)
-    if not m:
-        return None
+# Page splicing. Every managed page has an entry in a sidecar index
+# (cache/pages.json) holding its grid offsets, the hashes of the bytes before
+# and after the grid, and its PIPELINE markers. While a page's size and mtime
+# match its entry, inserts need no scanning: duplicate checks are set lookups
+# and the splice writes prefix + new blocks + rest straight from the original
+# buffer. Pages are rescanned in one pass when they were changed elsewhere.
+_PAGE_TOKEN_RE = re.compile(rb"<div\b[^>]*>|</div>|<!-- PIPELINE:(.*?) -->", re.IGNORECASE)
+_DIV_CLOSE = b"</div>"
+_PAGE_INDEX: dict | None = None
+
 
-    # Find matching </div> using depth counting from the matched opening div.
-    token_pat = re.compile(r'<div\b[^>]*>|</div>', re.IGNORECASE)
+def _sha(data: memoryview | bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def scan_grid_page(data: bytes, grid_class_snippet: str) -> dict | None:
+    """
+    Single pass over a page: locate the first grid <div> with depth counting,
+    collect every PIPELINE marker, and record each top-level pipeline card
+    in the grid as [marker start, card end, marker id] in document order.
+    """
+    open_pat = re.compile(rb'<div\s+class="[^"]*' + re.escape(grid_class_snippet.encode()) + rb'[^"]*">')
+    markers: list[str] = []
+    cards: list[list] = []
+    grid_start = grid_open_end = grid_end = None
     depth = 0
-    end_pos = None
-    for t in token_pat.finditer(text, m.start()):
-        tok = t.group(0).lower()
-        if tok.startswith("<div"):
+    pending: list | None = None
+    for t in _PAGE_TOKEN_RE.finditer(data):
+        if t.group(1) is not None:
+            marker_id = t.group(1).decode("utf-8")
+            markers.append(marker_id)
+            if depth == 1:
+                if pending:
+                    cards.append([pending[0], t.start(), pending[1]])
+                pending = [t.start(), marker_id]
+            continue
+        if grid_start is None:
+            if open_pat.match(t.group(0)):
+                grid_start, grid_open_end, depth = t.start(), t.end(), 1
+            continue
+        if depth == 0:
+            continue
+        if t.group(0)[:4].lower() == b"<div":
             depth += 1
-        else:
-            depth -= 1
-            if depth == 0:
-                end_pos = t.end()
-                break
+            continue
+        depth -= 1
+        if depth == 1 and pending:
+            cards.append([pending[0], t.end(), pending[1]])
+            pending = None
+        elif depth == 0:
+            grid_end = t.end()
+    if grid_end is None:
+        return None
+    return {
+        "gridStart": grid_start,
+        "gridOpenEnd": grid_open_end,
+        "gridEnd": grid_end,
+        "prefixSha": _sha(memoryview(data)[:grid_start]),
+        "suffixSha": _sha(memoryview(data)[grid_end:]),
+        "markers": markers,
+        "cards": cards,
+    }
+
+
+def _page_key(file_path: pathlib.Path, grid_class_snippet: str) -> str:
+    try:
+        rel = file_path.relative_to(SITE).as_posix()
+    except ValueError:
+        rel = file_path.as_posix()
+    return f"{rel}#{grid_class_snippet}"
+
+
+def _page_index() -> dict:
+    global _PAGE_INDEX
+    if _PAGE_INDEX is None:
+        try:
+            _PAGE_INDEX = json.loads(PAGE_INDEX_FILE.read_text(encoding="utf-8"))
+        except Exception:
+            _PAGE_INDEX = {}
+    return _PAGE_INDEX
+
 
-    if end_pos is None:
+def save_page_index() -> None:
+    if _PAGE_INDEX is None:
+        return
+    PAGE_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = PAGE_INDEX_FILE.with_name(PAGE_INDEX_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(_PAGE_INDEX, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(PAGE_INDEX_FILE)
+
+
+def page_entry(file_path: pathlib.Path, grid_class_snippet: str, data: bytes | None = None) -> dict | None:
+    """Index entry for a page, rescanning it only if it changed since it was indexed."""
+    if not file_path.exists():
+        return None
+    key = _page_key(file_path, grid_class_snippet)
+    st = file_path.stat()
+    entry = _page_index().get(key)
+    if entry and entry["size"] == st.st_size and entry["mtimeNs"] == st.st_mtime_ns:
+        return entry
+    entry = scan_grid_page(file_path.read_bytes() if data is None else data, grid_class_snippet)
+    if entry is None:
+        _page_index().pop(key, None)
         return None
-    return (m.start(), end_pos)
+    entry.update(size=st.st_size, mtimeNs=st.st_mtime_ns)
+    _page_index()[key] = entry
+    return entry
+
+
+def archive_pages(file_path: pathlib.Path) -> list[pathlib.Path]:
+    """Archive pages next to `file_path`, oldest (page-2) first."""
+    pages = [p for p in file_path.parent.glob("page-*.html") if p.stem[5:].isdigit()]
+    return sorted(pages, key=lambda p: int(p.stem[5:]))
+
+
+def _div_balanced(chunk: bytes) -> bool:
+    depth = 0
+    for t in _PAGE_TOKEN_RE.finditer(chunk):
+        if t.group(1) is not None:
+            continue
+        depth += 1 if t.group(0)[:4].lower() == b"<div" else -1
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def _check_boundary(file_path: pathlib.Path, grid_class_snippet: str, mv: memoryview, entry: dict) -> None:
+    if _sha(mv[: entry["gridStart"]]) != entry["prefixSha"] or _sha(mv[entry["gridEnd"] :]) != entry["suffixSha"]:
+        raise RuntimeError(
+            f"Boundary check failed for {file_path}: detected modifications outside .{grid_class_snippet} block"
+        )
+
+
+def _write_ranges(file_path: pathlib.Path, parts: list[memoryview | bytes]) -> None:
+    journal_touch(file_path)
+    tmp = file_path.with_name(file_path.name + ".tmp")
+    with tmp.open("wb") as f:
+        for part in parts:
+            f.write(part)
+    tmp.replace(file_path)
+
+
+def _splice_blocks(file_path: pathlib.Path, grid_class_snippet: str, blocks: list[tuple[str, str]], known: set[str]) -> int:
+    data = file_path.read_bytes()
+    entry = page_entry(file_path, grid_class_snippet, data)
+    if not entry:
+        return 0
+
+    chunks: list[tuple[str, bytes]] = []
+    for marker_id, block in blocks:
+        if marker_id in known:
+            continue
+        known.add(marker_id)
+        chunks.append((marker_id, f"<!-- PIPELINE:{marker_id} -->\n{block}".encode("utf-8")))
+    if not chunks:
+        return 0
+
+    insertion = b"\n" + b"\n".join(c for _, c in chunks) + b"\n"
+    # Boundary contract: a div-balanced insertion at the grid opening leaves
+    # the grid's closing tag, and everything after it, shifted but unchanged.
+    if not _div_balanced(insertion):
+        raise RuntimeError(f"Boundary check failed: unbalanced <div> in blocks for {file_path}")
+    mv = memoryview(data)
+    _check_boundary(file_path, grid_class_snippet, mv, entry)
+    idx = entry["gridOpenEnd"]
+    _write_ranges(file_path, [mv[:idx], insertion, mv[idx:]])
+
+    new_cards: list[list] = []
+    pos = idx + 1
+    for marker_id, chunk in chunks:
+        new_cards.append([pos, pos + len(chunk), marker_id])
+        pos += len(chunk) + 1
+    shift = len(insertion)
+    st = file_path.stat()
+    entry["cards"] = new_cards + [[s + shift, e + shift, m] for s, e, m in entry["cards"]]
+    entry["markers"] = [m for m, _ in chunks] + entry["markers"]
+    entry.update(gridEnd=entry["gridEnd"] + shift, size=st.st_size, mtimeNs=st.st_mtime_ns)
+    return len(chunks)
 
 
 def insert_blocks_after_grid_open(file_path: pathlib.Path, grid_class_snippet: str, blocks: list[tuple[str, str]]) -> int:
     """
     blocks: list of (unique_marker_id, html_block)
-    Inserts right after opening <div class="..."> of matching grid class.
+    Inserts right after opening <div class="..."> of matching grid class,
+    skipping markers already present on the page or its archive pages.
 
     Boundary contract:
     - only mutate inside the matched grid <div>...</div>
@@ -264,47 +2051,168 @@ def insert_blocks_after_grid_open(file_path: pathlib.Path, grid_class_snippet: s
     """
     if not file_path.exists() or not blocks:
         return 0
+    known: set[str] = set()
+    for page in [file_path, *archive_pages(file_path)]:
+        entry = page_entry(page, grid_class_snippet)
+        if entry:
+            known.update(entry["markers"])
+    added = _splice_blocks(file_path, grid_class_snippet, blocks, known)
+    save_page_index()
+    return added
 
-    text = file_path.read_text(encoding="utf-8")
 
-    old_bounds = find_grid_div_bounds(text, grid_class_snippet)
-    if not old_bounds:
-        return 0
-
-    open_pat = re.compile(rf'(<div\s+class="[^"]*{re.escape(grid_class_snippet)}[^"]*">)')
-    m = open_pat.search(text)
-    if not m:
-        return 0
+def archive_shell(data: bytes, entry: dict) -> list[bytes]:
+    """
+    Page for a new archive: the front page's chrome (head, header, footer)
+    around an empty copy of its grid. Everything else inside <main>, or
+    <body> on pages without one, is left out, so hand-written cards and
+    sections next to the grid are not copied onto every archive page.
+    """
+    head, tail = data[: entry["gridStart"]], data[entry["gridEnd"] :]
+    for tag in (b"main", b"body"):
+        opens = list(re.finditer(rb"<" + tag + rb"\b[^>]*>", head, re.I))
+        close = re.search(rb"</" + tag + rb"\s*>", tail, re.I)
+        if opens and close:
+            break
+    else:
+        return [data[: entry["gridOpenEnd"]], b"\n", data[entry["gridEnd"] - len(_DIV_CLOSE) :]]
+    indent = head[head.rfind(b"\n") + 1 :]
+    indent = indent if not indent.strip() else b""
+    close_at = tail.rfind(b"\n", 0, close.start()) + 1
+    if tail[close_at : close.start()].strip():
+        close_at = close.start()
+    grid_open = data[entry["gridStart"] : entry["gridOpenEnd"]]
+    return [
+        head[: opens[-1].end()],
+        b"\n" + indent + grid_open + b"\n" + indent + _DIV_CLOSE + b"\n",
+        tail[close_at:],
+    ]
 
-    inject_chunks = []
-    for marker_id, block in blocks:
-        marker = f"<!-- PIPELINE:{marker_id} -->"
-        if marker in text:
-            continue
-        inject_chunks.append(marker + "\n" + block)
 
-    if not inject_chunks:
+def roll_over_cards(file_path: pathlib.Path, grid_class_snippet: str, limit: int = CARDS_PER_PAGE) -> int:
+    """
+    Keep at most `limit` pipeline cards on a page by moving the oldest into
+    archive pages next to it (page-2.html, page-3.html, ...). Archive pages
+    are numbered in creation order, so page-2 holds the oldest cards and an
+    archive URL never changes once its page is full.
+    """
+    if not file_path.exists():
+        return 0
+    data = file_path.read_bytes()
+    entry = page_entry(file_path, grid_class_snippet, data)
+    if not entry or len(entry["cards"]) <= limit:
+        if _NAV_OPEN not in data and archive_pages(file_path):
+            update_archive_nav(file_path, grid_class_snippet)
         return 0
 
-    insertion = "\n" + "\n".join(inject_chunks) + "\n"
-    idx = m.end()
-    new_text = text[:idx] + insertion + text[idx:]
-
-    # Boundary safety check: no mutations allowed outside target grid block.
-    new_bounds = find_grid_div_bounds(new_text, grid_class_snippet)
-    if not new_bounds:
-        raise RuntimeError(f"Boundary check failed: cannot locate grid in updated file {file_path}")
-
-    old_start, old_end = old_bounds
-    new_start, new_end = new_bounds
-
-    if text[:old_start] != new_text[:new_start] or text[old_end:] != new_text[new_end:]:
-        raise RuntimeError(
-            f"Boundary check failed for {file_path}: detected modifications outside .{grid_class_snippet} block"
-        )
-
-    file_path.write_text(new_text, encoding="utf-8")
-    return len(inject_chunks)
+    mv = memoryview(data)
+    _check_boundary(file_path, grid_class_snippet, mv, entry)
+    overflow = entry["cards"][limit:]  # newest first
+    moved: list[tuple[str, str]] = []
+    for start, end, marker_id in overflow:
+        marker_len = len(f"<!-- PIPELINE:{marker_id} -->\n".encode("utf-8"))
+        moved.append((marker_id, bytes(mv[start + marker_len : end]).decode("utf-8")))
+
+    # Fill archives oldest-first before removing anything from the page, so
+    # an interrupted rollover duplicates cards rather than losing them.
+    pending = list(reversed(moved))
+    archives = archive_pages(file_path)
+    created = _NAV_OPEN not in data
+    shell_parts = archive_shell(data, entry)
+    while pending:
+        target = archives[-1] if archives else None
+        target_entry = page_entry(target, grid_class_snippet) if target else None
+        room = limit - len(target_entry["cards"]) if target_entry else 0
+        if room <= 0:
+            num = int(archives[-1].stem[5:]) + 1 if archives else 2
+            target = file_path.with_name(f"page-{num}.html")
+            _write_ranges(target, shell_parts)
+            archives.append(target)
+            created = True
+            room = limit
+        chunk, pending = pending[:room], pending[room:]
+        existing = set(page_entry(target, grid_class_snippet)["markers"])
+        _splice_blocks(target, grid_class_snippet, list(reversed(chunk)), existing)
+
+    keep: list[memoryview] = []
+    pos = 0
+    removed = 0
+    for start, end, _ in sorted(overflow):
+        if start > 0 and data[start - 1 : start] == b"\n":
+            start -= 1
+        keep.append(mv[pos:start])
+        removed += end - start
+        pos = end
+    keep.append(mv[pos:])
+    _write_ranges(file_path, keep)
+
+    moved_ids = {m for _, _, m in overflow}
+    st = file_path.stat()
+    entry["cards"] = entry["cards"][:limit]
+    entry["markers"] = [m for m in entry["markers"] if m not in moved_ids]
+    entry.update(gridEnd=entry["gridEnd"] - removed, size=st.st_size, mtimeNs=st.st_mtime_ns)
+    if created:
+        update_archive_nav(file_path, grid_class_snippet)
+    save_page_index()
+    return len(overflow)
+
+
+# Archive navigation. The front page and each archive end their grid with one
+# pipeline-owned nav block between PIPELINE-NAV comments. It carries no
+# PIPELINE: marker, so card accounting, rollover and search never see it. The
+# chain runs front -> newest archive -> ... -> page-2, and only needs relinking
+# when an archive page is created.
+_NAV_OPEN = b"<!-- PIPELINE-NAV -->"
+_NAV_RE = re.compile(rb"\n?<!-- PIPELINE-NAV -->.*?<!-- /PIPELINE-NAV -->", re.S)
+
+
+def render_archive_nav(newer: str | None, older: str | None) -> bytes:
+    links = []
+    if newer:
+        links.append(f'<a href="{newer}">&larr; Newer entries</a>')
+    if older:
+        links.append(f'<a href="{older}">Older entries &rarr;</a>')
+    return (
+        "\n<!-- PIPELINE-NAV -->\n"
+        '                <div class="card">\n'
+        '                    <div class="card-meta"><span>Archive</span></div>\n'
+        f'                    <div class="card-body"><p>{" &middot; ".join(links)}</p></div>\n'
+        "                </div>\n"
+        "<!-- /PIPELINE-NAV -->"
+    ).encode("utf-8")
+
+
+def _set_grid_nav(file_path: pathlib.Path, grid_class_snippet: str, nav: bytes) -> bool:
+    """Replace the nav block at the end of a page's grid; False if already current."""
+    data = file_path.read_bytes()
+    entry = page_entry(file_path, grid_class_snippet, data)
+    if not entry:
+        return False
+    start, end = entry["gridOpenEnd"], entry["gridEnd"] - len(_DIV_CLOSE)
+    body = data[start:end]
+    found = _NAV_RE.search(body)
+    if found and found.group(0) == nav:
+        return False
+    mv = memoryview(data)
+    _check_boundary(file_path, grid_class_snippet, mv, entry)
+    if found:
+        body = body[: found.start()] + body[found.end() :]
+    head = body.rstrip()
+    _write_ranges(file_path, [mv[:start], head, nav, body[len(head) :], mv[end:]])
+    page_entry(file_path, grid_class_snippet)  # rescan: card offsets before the nav are unchanged
+    return True
+
+
+def update_archive_nav(file_path: pathlib.Path, grid_class_snippet: str) -> None:
+    """Link the front page and its archives newest to oldest."""
+    chain = [file_path, *reversed(archive_pages(file_path))]
+    if len(chain) < 2:
+        return
+    for i, page in enumerate(chain):
+        newer = chain[i - 1].name if i > 0 else None
+        older = chain[i + 1].name if i + 1 < len(chain) else None
+        _set_grid_nav(page, grid_class_snippet, render_archive_nav(newer, older))
+    save_page_index()
 
 
 RELEVANCE_KEYWORDS = [
@@ -320,7 +2228,13 @@ RELEVANCE_KEYWORDS = [
 ]
 
 THREAD_STATE_FILE = STATE_DIR / "thread_state.json"
+THREAD_REGISTRY_FILE = STATE_DIR / "threads.json"
 NEWS_STATE_FILE = STATE_DIR / "news_state.json"
+THREAD_NOVELTY_HALF_LIFE_D = 1.0
+THREAD_EVIDENCE_HALF_LIFE_D = 30.0
+THREAD_STALE_CAP_D = 10.0
+THREAD_DEPTH_WEIGHT = 0.1  # score per unit of whole-history evidence depth (at most EVIDENCE_TOP_K)
+# Built-in registry, used when THREAD_REGISTRY_FILE is missing.
 THREADS = [
     {
         "id": "substrate-boundaries",
@@ -339,9 +2253,114 @@ THREADS = [
 ]
 
 
+# Relevance engine: RELEVANCE_KEYWORDS compile into one regex whose lookahead
+# alternation reports the longest keyword starting at every position, so a
+# single scan yields all (possibly overlapping) hits as a bitmask over the
+# keyword list. Item masks are cached by (id, topic), so each item's text is
+# normalized and scanned once per process.
+RELEVANCE_CACHE_MAX = 100_000
+_KEYWORD_MATCHER: tuple[re.Pattern, dict[str, int]] | None = None
+_ITEM_MASKS: dict[tuple[str, str], int] = {}
+
+
+def reset_relevance_cache() -> None:
+    """Drop the compiled matcher and cached masks (call after editing RELEVANCE_KEYWORDS)."""
+    global _KEYWORD_MATCHER, _THREAD_REGISTRY
+    _KEYWORD_MATCHER = None
+    _THREAD_REGISTRY = None
+    _ITEM_MASKS.clear()
+
+
+def compile_keyword_matcher(keywords: list[str], word_start: bool = False) -> tuple[re.Pattern, dict[str, int]]:
+    """Matcher for `keywords` (bit i = keywords[i]); `word_start` only matches at the start of words."""
+    bits: dict[str, int] = {}
+    for i, k in enumerate(keywords):
+        bits[k.lower()] = bits.get(k.lower(), 0) | (1 << i)
+    # A match is the longest keyword at its position; shorter keywords
+    # starting there are exactly its keyword prefixes, so fold them in.
+    closure = {k: sum(b for j, b in bits.items() if k.startswith(j)) for k in bits}
+    alternation = "|".join(re.escape(k) for k in sorted(bits, key=len, reverse=True))
+    anchor = r"\b" if word_start else ""
+    return re.compile(f"{anchor}(?=({alternation}))"), closure
+
+
+def _keyword_matcher() -> tuple[re.Pattern, dict[str, int]]:
+    global _KEYWORD_MATCHER
+    if _KEYWORD_MATCHER is None:
+        _KEYWORD_MATCHER = compile_keyword_matcher(RELEVANCE_KEYWORDS)
+    return _KEYWORD_MATCHER
+
+
+def matcher_mask(matcher: tuple[re.Pattern, dict[str, int]], text: str) -> int:
+    pattern, closure = matcher
+    mask = 0
+    for m in pattern.finditer(text.lower()):
+        mask |= closure[m.group(1)]
+    return mask
+
+
+def text_keyword_mask(text: str) -> int:
+    return matcher_mask(_keyword_matcher(), text)
+
+
+def item_keyword_mask(item: dict) -> int:
+    """Bitmask of RELEVANCE_KEYWORDS found in the item's title, summary and topic."""
+    key = (item.get("id", ""), item.get("topic", ""))
+    mask = _ITEM_MASKS.get(key)
+    if mask is None:
+        mask = text_keyword_mask(f"{item.get('title','')} {item.get('summary','')} {item.get('topic','')}")
+        if key[0]:
+            if len(_ITEM_MASKS) >= RELEVANCE_CACHE_MAX:
+                _ITEM_MASKS.clear()
+            _ITEM_MASKS[key] = mask
+    return mask
+
+
+def thread_keyword_mask(thread: dict) -> int:
+    return text_keyword_mask(thread.get("title", "") + " " + thread.get("hypothesis", ""))
+
+
+# Topic attribution for batched queries: every topic word is reduced to a
+# short stem (plural 's' dropped, first 6 letters) so that 'biology' also
+# matches 'biological', and the stems are compiled like the relevance
+# keywords, anchored at word starts. An item belongs to each topic whose
+# stems all occur in its title or summary.
+_TOPIC_MATCHERS: dict[tuple[str, ...], tuple] = {}
+
+
+def topic_stem(word: str) -> str:
+    word = word.lower()
+    if len(word) > 4 and word.endswith("s"):
+        word = word[:-1]
+    return word[:6]
+
+
+def _topic_matcher(topics: list[str]) -> tuple:
+    key = tuple(topics)
+    found = _TOPIC_MATCHERS.get(key)
+    if found is None:
+        stems = sorted({topic_stem(w) for t in topics for w in tokenize(t)})
+        bit = {stem: 1 << i for i, stem in enumerate(stems)}
+        required = [(t, sum(bit[topic_stem(w)] for w in set(tokenize(t)))) for t in topics]
+        if len(_TOPIC_MATCHERS) >= 256:
+            _TOPIC_MATCHERS.clear()
+        found = _TOPIC_MATCHERS[key] = (compile_keyword_matcher(stems, word_start=True), required)
+    return found
+
+
+def attribute_topics(item: dict, topics: list[str]) -> dict:
+    """Set item["topics"] to the matching topics (best partial match if none) and item["topic"] to the first."""
+    matcher, required = _topic_matcher(topics)
+    mask = matcher_mask(matcher, f"{item.get('title','')} {item.get('summary','')}")
+    tagged = [t for t, req in required if req and mask & req == req]
+    if not tagged:
+        tagged = [max(required, key=lambda r: (mask & r[1]).bit_count())[0]]
+    item["topic"], item["topics"] = tagged[0], tagged
+    return item
+
+
 def is_relevant_to_cohera(item: dict) -> bool:
-    text = f"{item.get('title','')} {item.get('summary','')} {item.get('topic','')}".lower()
-    return any(k in text for k in RELEVANCE_KEYWORDS)
+    return item_keyword_mask(item) != 0
 
 
 def pick_relevant_item(candidates: list[dict]) -> dict | None:
@@ -353,7 +2372,7 @@ def pick_relevant_item(candidates: list[dict]) -> dict | None:
 
 def load_thread_state() -> dict:
     if not THREAD_STATE_FILE.exists():
-        return {"run": 0, "threads": {}}
+        return {"run": 0, "threads": {}, "queue": []}
     try:
         data = json.loads(THREAD_STATE_FILE.read_text(encoding="utf-8"))
         # migrate legacy format {run, cursor}
@@ -362,79 +2381,330 @@ def load_thread_state() -> dict:
             data = {"run": run_legacy, "threads": {}}
         if "run" not in data:
             data["run"] = 0
+        data.setdefault("queue", [])
         return data
     except Exception:
-        return {"run": 0, "threads": {}}
+        return {"run": 0, "threads": {}, "queue": []}
 
 
 def save_thread_state(state: dict) -> None:
-    THREAD_STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write(THREAD_STATE_FILE, json.dumps(state, ensure_ascii=False, indent=2))
+
+
+# Thread registry: threads come from THREAD_REGISTRY_FILE. Each thread keeps
+# decayed novelty and evidence counters in the thread state. They are bumped
+# once, when integrate_new_items() admits a paper sharing keywords with the
+# thread (found through a keyword bit -> threads table), and halve every
+# THREAD_*_HALF_LIFE_D days. Each thread also keeps its depth: the summed
+# capped BM25 strength of its EVIDENCE_TOP_K best matches over the whole feed
+# history, and the ids of the strongest few. Depth is refreshed from the
+# evidence index for threads that gained evidence (and for new threads), so
+# between refreshes it is a constant of the score. choose_thread() keeps a
+# max-heap of score upper bounds (counters as last written, full staleness
+# credit) in the state and pops threads until no remaining bound can beat the
+# best exact score.
+_THREAD_REGISTRY: dict | None = None
+
+
+def thread_registry() -> dict:
+    """Registry threads with lookup tables; reloaded when the file changes."""
+    global _THREAD_REGISTRY
+    try:
+        stamp = THREAD_REGISTRY_FILE.stat().st_mtime_ns
+    except OSError:
+        stamp = "builtin"  # no registry file: the built-in THREADS
+    if _THREAD_REGISTRY is None or _THREAD_REGISTRY["stamp"] != stamp:
+        threads = THREADS
+        if stamp != "builtin":
+            try:
+                threads = json.loads(THREAD_REGISTRY_FILE.read_text(encoding="utf-8"))["threads"]
+            except Exception:
+                threads = THREADS
+        by_bit: dict[int, list[str]] = {}
+        for t in threads:
+            mask = thread_keyword_mask(t)
+            while mask:
+                low = mask & -mask
+                by_bit.setdefault(low.bit_length() - 1, []).append(t["id"])
+                mask ^= low
+        _THREAD_REGISTRY = {
+            "stamp": stamp,
+            "byId": {t["id"]: t for t in threads},
+            "order": {t["id"]: i for i, t in enumerate(threads)},
+            "byBit": by_bit,
+            "terms": {t["id"]: set(tokenize(f"{t.get('title','')} {t.get('hypothesis','')}")) for t in threads},
+        }
+    return _THREAD_REGISTRY
+
+
+def thread_counters(ts: dict, now_ts: float) -> tuple[float, float]:
+    """(novelty, evidence) decayed to `now_ts`."""
+    age_d = max(0.0, now_ts - ts.get("countersAt", now_ts)) / 86400.0
+    return (
+        ts.get("novelty", 0.0) * 0.5 ** (age_d / THREAD_NOVELTY_HALF_LIFE_D),
+        ts.get("evidence", 0.0) * 0.5 ** (age_d / THREAD_EVIDENCE_HALF_LIFE_D),
+    )
 
 
-def load_news_state() -> dict:
-    if not NEWS_STATE_FILE.exists():
-        return {"postedIds": [], "lastTopic": ""}
-    try:
-        d = json.loads(NEWS_STATE_FILE.read_text(encoding="utf-8"))
-        if "postedIds" not in d:
-            d["postedIds"] = []
-        if "lastTopic" not in d:
-            d["lastTopic"] = ""
-        return d
-    except Exception:
-        return {"postedIds": [], "lastTopic": ""}
+def thread_score(ts: dict, now: dt.datetime) -> float:
+    stale_days = 7.0
+    if ts.get("lastRun"):
+        try:
+            stale_days = max(0.0, (now - dt.datetime.fromisoformat(ts["lastRun"])).total_seconds() / 86400.0)
+        except Exception:
+            stale_days = 7.0
+    novelty, evidence = thread_counters(ts, now.timestamp())
+    continuity_penalty = int(ts.get("iterations", 0)) * 0.8
+    # Higher score = higher priority to continue this thread.
+    depth = ts.get("depth", 0.0) * THREAD_DEPTH_WEIGHT
+    return (novelty * 3.0) + (evidence * 0.4) + depth + min(stale_days, THREAD_STALE_CAP_D) - continuity_penalty
+
+
+def _thread_requeue(st: dict, tid: str, now_ts: float) -> None:
+    """Fold decay into the stored counters and push the thread's new score bound."""
+    ts = st["threads"].setdefault(tid, {})
+    novelty, evidence = thread_counters(ts, now_ts)
+    ts.update(novelty=round(novelty, 6), evidence=round(evidence, 6), countersAt=now_ts)
+    ts["version"] = int(ts.get("version", 0)) + 1
+    bound = (
+        ts["novelty"] * 3.0
+        + ts["evidence"] * 0.4
+        + ts.get("depth", 0.0) * THREAD_DEPTH_WEIGHT
+        + THREAD_STALE_CAP_D
+        - int(ts.get("iterations", 0)) * 0.8
+    )
+    queue = st["queue"]
+    heapq.heappush(queue, [-bound, tid, ts["version"]])
+    if len(queue) > 4 * len(st["threads"]) + 64:
+        # Runs that only admit papers never pop; drop superseded entries here.
+        queue[:] = [e for e in queue if st["threads"].get(e[1], {}).get("version") == e[2]]
+        heapq.heapify(queue)
 
 
-def save_news_state(state: dict) -> None:
-    NEWS_STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+def thread_top_evidence(index: dict, thread: dict) -> list[tuple[str, float]]:
+    """The thread's EVIDENCE_TOP_K best matches over the whole feed history, as (paper id, score)."""
+    return bm25_top_k(index, f"{thread.get('title', '')} {thread.get('hypothesis', '')}")
 
 
-def thread_keyword_hits(thread: dict, items: list[dict]) -> int:
-    text = (thread.get("title", "") + " " + thread.get("hypothesis", "")).lower()
-    keys = [k for k in RELEVANCE_KEYWORDS if k in text]
-    hits = 0
+def observe_thread_evidence(st: dict, items: list[dict], index: dict | None = None) -> None:
+    """
+    Count just-admitted items toward the threads they share keywords with:
+    one novelty hit each, and one evidence hit each (BM25 relevance to the
+    thread, capped at one, when an evidence index is given). With an index,
+    threads that gained evidence, or never had it ranked, also get their
+    depth and strongest matches refreshed from thread_top_evidence().
+    """
+    reg = thread_registry()
+    gains: dict[str, list[float]] = {}
     for it in items:
-        blob = f"{it.get('title','')} {it.get('summary','')} {it.get('topic','')}".lower()
-        if any(k in blob for k in keys):
-            hits += 1
-    return hits
+        mask = item_keyword_mask(it)
+        touched: set[str] = set()
+        while mask:
+            low = mask & -mask
+            touched.update(reg["byBit"].get(low.bit_length() - 1, ()))
+            mask ^= low
+        for tid in touched:
+            hit = 1.0 if index is None else min(1.0, bm25_doc_score(index, it, reg["terms"][tid]) / BM25_HIT_SCORE)
+            gain = gains.setdefault(tid, [0.0, 0.0])
+            gain[0] += 1.0
+            gain[1] += hit
+    now_ts = now_lima().timestamp()
+    st.setdefault("queue", [])
+    threads = st.setdefault("threads", {})
+    for tid, (novelty, evidence) in gains.items():
+        ts = threads.setdefault(tid, {})
+        n0, e0 = thread_counters(ts, now_ts)
+        ts.update(novelty=n0 + novelty, evidence=e0 + evidence, countersAt=now_ts)
+    ranked: set[str] = set()
+    if index is not None:
+        ranked = {tid for tid in reg["order"] if tid in gains or "depth" not in threads.get(tid, {})}
+        for tid in ranked:
+            top = thread_top_evidence(index, reg["byId"][tid])
+            ts = threads.setdefault(tid, {})
+            ts["depth"] = round(sum(min(1.0, score / BM25_HIT_SCORE) for _, score in top), 4)
+            ts["topEvidence"] = [pid for pid, _ in top[:EVIDENCE_SHOWN]]
+    for tid in set(gains) | ranked:
+        _thread_requeue(st, tid, now_ts)
+
+
+# News scheduler: unposted discovered items are queued per topic (an item
+# with several topics sits in each queue; posted ones are skipped lazily) and
+# topics take turns by weighted round robin. Each round a topic gets
+# NEWS_TOPIC_WEIGHTS.get(topic, 1) picks, interleaved with the other topics;
+# topics whose credits run out wait in `waiting` until the round ends. The
+# rotation, credits and an LRU of the last NEWS_POSTED_MAX posted canonical
+# ids persist in NEWS_STATE_FILE, so the rotation carries over between runs.
+NEWS_POSTED_MAX = 2000
+NEWS_TOPIC_WEIGHTS: dict[str, int] = {}
+
+
+def _news_weight(topic: str) -> int:
+    return max(1, int(NEWS_TOPIC_WEIGHTS.get(topic, 1)))
 
 
-def choose_thread(new_items: list[dict], feed_items: list[dict], st: dict) -> dict:
-    now = now_lima()
-    threads_state = st.setdefault("threads", {})
-    scored: list[tuple[float, dict, dict]] = []
-
-    for t in THREADS:
-        ts = threads_state.get(t["id"], {})
-        iterations = int(ts.get("iterations", 0))
-        last_run = ts.get("lastRun")
-        stale_days = 7.0
-        if last_run:
-            try:
-                dt_last = dt.datetime.fromisoformat(last_run)
-                stale_days = max(0.0, (now - dt_last).total_seconds() / 86400.0)
-            except Exception:
-                stale_days = 7.0
+def load_news_state() -> dict:
+    try:
+        d = json.loads(NEWS_STATE_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        d = {}
+    # Legacy state: {postedIds: [full ids], lastTopic}.
+    posted = d.get("posted") or [canonical_paper_id(x) for x in d.get("postedIds", [])]
+    ns: dict = {
+        "posted": {pid: seq for seq, pid in enumerate(posted[-NEWS_POSTED_MAX:])},
+        "rotation": collections.deque(d.get("rotation", [])),
+        "waiting": collections.deque(d.get("waiting", [])),
+        "idle": [],
+        "credits": dict(d.get("credits", {})),
+        "lastTopic": d.get("lastTopic", ""),
+    }
+    ns["seq"] = len(ns["posted"])
+    if "rotation" not in d and ns["lastTopic"]:
+        # Start the first rotation after the topic posted last.
+        ns["waiting"].append(ns["lastTopic"])
+        ns["credits"][ns["lastTopic"]] = 0
+    return ns
+
+
+def save_news_state(ns: dict) -> None:
+    state = {
+        "format": "cohera-news/2",
+        "lastTopic": ns["lastTopic"],
+        # Topics with nothing to post this run keep their turn.
+        "rotation": ns["idle"] + list(ns["rotation"]),
+        "waiting": list(ns["waiting"]),
+        "credits": ns["credits"],
+        "posted": list(ns["posted"]),  # oldest first
+    }
+    atomic_write(NEWS_STATE_FILE, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+
 
-        novelty_hits = thread_keyword_hits(t, new_items)
-        evidence_hits = thread_keyword_hits(t, feed_items[:40])
-        continuity_penalty = iterations * 0.8
+def news_mark_posted(ns: dict, item: dict) -> None:
+    pid = canonical_paper_id(item.get("id", ""))
+    posted = ns["posted"]
+    posted.pop(pid, None)
+    posted[pid] = ns["seq"]
+    ns["seq"] += 1
+    if len(posted) > NEWS_POSTED_MAX:
+        del posted[next(iter(posted))]
 
-        # Higher score = higher priority to continue this thread.
-        score = (novelty_hits * 3.0) + (evidence_hits * 0.4) + min(stale_days, 10.0) - continuity_penalty
-        scored.append((score, t, ts))
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    _, winner, winner_state = scored[0]
-    return {"thread": winner, "thread_state": winner_state}
+def news_queues(discovered: list[dict], ns: dict) -> dict[str, collections.deque]:
+    """Per-topic queues of unposted items (in discovered order); new topics join the rotation."""
+    queues: dict[str, collections.deque] = {}
+    posted = ns["posted"]
+    for it in discovered:
+        if canonical_paper_id(it.get("id", "")) in posted:
+            continue
+        for t in it.get("topics") or [it.get("topic", "")]:
+            queues.setdefault(t, collections.deque()).append(it)
+    known = set(ns["rotation"]) | set(ns["waiting"])
+    for t in queues:
+        if t not in known:
+            ns["rotation"].append(t)
+            ns["credits"][t] = _news_weight(t)
+    return queues
+
+
+def news_pick(ns: dict, queues: dict[str, collections.deque]) -> dict | None:
+    """Next item by weighted round robin over topics, or None when every queue is empty."""
+    posted = ns["posted"]
+    credits = ns["credits"]
+    while True:
+        if not ns["rotation"]:
+            if not ns["waiting"]:
+                return None
+            # Round over: waiting topics get their credits back.
+            for t in ns["waiting"]:
+                credits[t] = _news_weight(t)
+            ns["rotation"], ns["waiting"] = ns["waiting"], ns["rotation"]
+        t = ns["rotation"].popleft()
+        q = queues.get(t)
+        while q and canonical_paper_id(q[0].get("id", "")) in posted:
+            q.popleft()
+        if not q:
+            ns["idle"].append(t)
+            continue
+        item = q.popleft()
+        credits[t] = credits.get(t, 1) - 1
+        (ns["rotation"] if credits[t] > 0 else ns["waiting"]).append(t)
+        news_mark_posted(ns, item)
+        ns["lastTopic"] = t
+        return item
 
 
-def next_thread_update(new_items: list[dict], feed_items: list[dict]) -> dict:
+def choose_news_items(discovered: list[dict], n: int = MAX_HOME_NEWS) -> list[dict]:
+    """
+    Up to n scientific news items for the home page. When every discovered
+    item has been posted already, the one posted longest ago is reused.
+    News state is written once.
+    """
+    ns = load_news_state()
+    queues = news_queues(discovered, ns)
+    picks: list[dict] = []
+    while len(picks) < n:
+        item = news_pick(ns, queues)
+        if item is None:
+            break
+        picks.append(item)
+    if not picks and discovered and n > 0:
+        item = min(discovered, key=lambda x: ns["posted"].get(canonical_paper_id(x.get("id", "")), -1))
+        news_mark_posted(ns, item)
+        ns["lastTopic"] = item.get("topic", "")
+        picks.append(item)
+    if picks:
+        save_news_state(ns)
+    return picks
+
+
+def choose_thread(st: dict, now: dt.datetime | None = None) -> dict:
+    """Pick the thread to continue: the best thread_score(), found through the bound heap."""
+    now = now or now_lima()
+    now_ts = now.timestamp()
+    reg = thread_registry()
+    threads = st.setdefault("threads", {})
+    queue = st.setdefault("queue", [])
+    queued = {e[1] for e in queue}
+    if (
+        "registry" not in st
+        or st["registry"] != reg["stamp"]
+        or len(queue) > 4 * len(reg["order"]) + 64
+        or any(tid not in queued for tid in reg["order"])
+    ):
+        # Fresh state, registry edited, a thread missing from the heap, or a heap
+        # full of superseded entries: rebuild it.
+        queue.clear()
+        for tid in reg["order"]:
+            threads.setdefault(tid, {})
+            _thread_requeue(st, tid, now_ts)
+        st["registry"] = reg["stamp"]
+
+    best: tuple[float, int, str] | None = None
+    popped: list[str] = []
+    while queue:
+        neg_bound, tid, version = queue[0]
+        if tid not in reg["order"] or threads.get(tid, {}).get("version") != version:
+            heapq.heappop(queue)  # superseded entry
+            continue
+        if best is not None and -neg_bound < best[0]:
+            break
+        heapq.heappop(queue)
+        popped.append(tid)
+        key = (thread_score(threads[tid], now), -reg["order"][tid], tid)
+        if best is None or key > best:
+            best = key
+    for tid in popped:
+        _thread_requeue(st, tid, now_ts)  # tighter bound now that decay is folded in
+    if best is None:
+        raise RuntimeError(f"no research threads in {THREAD_REGISTRY_FILE}")
+    winner = reg["byId"][best[2]]
+    return {"thread": winner, "thread_state": threads[best[2]]}
+
+
+def next_thread_update() -> dict:
     st = load_thread_state()
     run = int(st.get("run", 0)) + 1
 
-    pick = choose_thread(new_items, feed_items, st)
+    pick = choose_thread(st)
     thread = pick["thread"]
     ts = st.setdefault("threads", {}).setdefault(thread["id"], {})
 
@@ -448,6 +2718,7 @@ def next_thread_update(new_items: list[dict], feed_items: list[dict]) -> dict:
 
     ts["iterations"] = int(ts.get("iterations", 0)) + 1
     ts["lastRun"] = now_lima().isoformat()
+    _thread_requeue(st, thread["id"], now_lima().timestamp())
     st["run"] = run
     save_thread_state(st)
 
@@ -456,50 +2727,18 @@ def next_thread_update(new_items: list[dict], feed_items: list[dict]) -> dict:
         "step": step,
         "step_text": step_text,
         "run": run,
+        "evidence": list(ts.get("topEvidence", [])),
     }
 
 
-def choose_diverse_news_item(discovered: list[dict]) -> dict | None:
-    ns = load_news_state()
-    posted = set(ns.get("postedIds", []))
-    last_topic = ns.get("lastTopic", "")
-
-    # 1) Prefer unseen item with topic different from last published topic.
-    for it in discovered:
-        if it.get("id") not in posted and it.get("topic") != last_topic:
-            ns["postedIds"] = (ns.get("postedIds", []) + [it.get("id")])[-200:]
-            ns["lastTopic"] = it.get("topic", "")
-            save_news_state(ns)
-            return it
+def append_home_and_research(
+    new_items: list[dict],
+    discovered: list[dict],
+    digest_file: pathlib.Path,
+    source_file: pathlib.Path,
+) -> tuple[int, int]:
+    import textwrap
 
-    # 2) Then unseen item regardless of topic.
-    for it in discovered:
-        if it.get("id") not in posted:
-            ns["postedIds"] = (ns.get("postedIds", []) + [it.get("id")])[-200:]
-            ns["lastTopic"] = it.get("topic", "")
-            save_news_state(ns)
-            return it
-
-    # 3) Reset cycle when exhausted, still prefer topic switch.
-    ns["postedIds"] = []
-    for it in discovered:
-        if it.get("topic") != last_topic:
-            ns["postedIds"] = [it.get("id")]
-            ns["lastTopic"] = it.get("topic", "")
-            save_news_state(ns)
-            return it
-
-    if discovered:
-        it = discovered[0]
-        ns["postedIds"] = [it.get("id")]
-        ns["lastTopic"] = it.get("topic", "")
-        save_news_state(ns)
-        return it
-
-    return None
-
-
-def append_home_and_research(new_items: list[dict], feed_items: list[dict], discovered: list[dict], digest_file: pathlib.Path, source_file: pathlib.Path) -> tuple[int, int]:
     home_file = SITE / "index.html"
     research_file = SITE / "research" / "index.html"
 
@@ -507,19 +2746,24 @@ def append_home_and_research(new_items: list[dict], feed_items: list[dict], disc
     run_date = now_lima().strftime("%d/%m/%Y")
 
     # Home should be real diverse scientific news.
-    news_item = choose_diverse_news_item(discovered)
+    news_items = choose_news_items(discovered, MAX_HOME_NEWS)
 
     # Research should continue the strongest relevant thread.
     chosen = pick_relevant_item(new_items)
+    record_pick("news", [it.get("id", "") for it in news_items])
 
     if not chosen:
-        upd = next_thread_update(new_items, feed_items)
+        upd = next_thread_update()
         thread = upd["thread"]
+        record_pick("research", f"thread:{thread['id']}")
         pid = slugify(thread["id"] + f"-r{upd['run']}")
         process_body = (
             f"Development step {upd['step']}: {upd['step_text']} "
             f"Evidence log: {digest_file.relative_to(ROOT)} | Source snapshot: {source_file.relative_to(ROOT)}."
         )
+        cited = feed_lookup(upd["evidence"])
+        if cited:
+            process_body += " Strongest evidence: " + "; ".join(f"{it.get('title', '')} ({it.get('id', '')})" for it in cited) + "."
         research_blocks: list[tuple[str, str]] = [
             (
                 f"research:run:{run_stamp}:{pid}",
@@ -533,10 +2777,12 @@ def append_home_and_research(new_items: list[dict], feed_items: list[dict], disc
             )
         ]
     else:
+        record_pick("research", chosen.get("id", ""))
         pid = slugify(chosen.get("id", chosen.get("title", "")))
+        evidence = digest_location(chosen.get("id", "")) or digest_file.relative_to(ROOT)
         process_body = (
             "Development step: this source was integrated into the active Cohera research thread, claims were extracted, "
-            f"and evidence was logged in {digest_file.relative_to(ROOT)} (snapshot: {source_file.relative_to(ROOT)})."
+            f"and evidence was logged in {evidence} (snapshot: {source_file.relative_to(ROOT)})."
         )
         research_blocks = [
             (
@@ -552,9 +2798,9 @@ def append_home_and_research(new_items: list[dict], feed_items: list[dict], disc
         ]
 
     home_blocks: list[tuple[str, str]] = []
-    if news_item:
+    for news_item in news_items:
         news_pid = slugify(news_item.get("id", news_item.get("title", "")))
-        home_blocks = [
+        home_blocks.append(
             (
                 f"home:run:{run_stamp}:{news_pid}",
                 render_card(
@@ -565,32 +2811,82 @@ def append_home_and_research(new_items: list[dict], feed_items: list[dict], disc
                     news_item.get("id", ""),
                 ),
             )
-        ]
+        )
 
-    h = insert_blocks_after_grid_open(home_file, "grid-1", home_blocks)
-    r = insert_blocks_after_grid_open(research_file, "grid-2", research_blocks)
+    h = insert_blocks_after_grid_open(home_file, "grid-1", home_blocks[:MAX_HOME_NEWS])
+    r = insert_blocks_after_grid_open(research_file, "grid-2", research_blocks[:MAX_RESEARCH_FEED])
+    roll_over_cards(home_file, "grid-1")
+    roll_over_cards(research_file, "grid-2")
     return h, r
 
 
+def file_sha256(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_pdf(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """Hardlink when on the same filesystem, else copy2 (sendfile/copy_file_range); atomic either way."""
+    journal_touch(dst)
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    tmp.replace(dst)
+
+
 def sync_publication_pdfs() -> list[pathlib.Path]:
     """
     Only sync Cohera-authored final publications.
     Source of truth: research/publications/final/*.pdf
+
+    Incremental: a manifest of (size, mtime, sha256) per source file lets
+    unchanged files be skipped on a stat; files whose stat changed are
+    hashed and copied only if their content did. PDFs no longer in the
+    source are removed, like the rsync --delete in build_publication_pdfs.sh.
+    Returns every published PDF.
     """
     src = RESEARCH / "publications" / "final"
     dst = SITE / "publications" / "pdf"
-    copied: list[pathlib.Path] = []
+    dst.mkdir(parents=True, exist_ok=True)
 
     if not src.exists():
-        # Ensure destination exists but do not auto-import external resource PDFs.
-        dst.mkdir(parents=True, exist_ok=True)
-        return copied
+        # Do not auto-import external resource PDFs (or delete anything) without a source of truth.
+        return []
+
+    try:
+        manifest = json.loads(PDF_MANIFEST_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        manifest = {}
 
+    current: dict[str, dict] = {}
     for f in sorted(src.glob("*.pdf")):
+        st = f.stat()
         t = dst / f.name
-        t.write_bytes(f.read_bytes())
-        copied.append(t)
-    return copied
+        prev = manifest.get(f.name)
+        in_place = t.exists() and t.stat().st_size == st.st_size
+        if prev and in_place and prev["size"] == st.st_size and prev["mtimeNs"] == st.st_mtime_ns:
+            current[f.name] = prev
+            continue
+        digest = file_sha256(f)
+        if not (prev and in_place and prev["sha256"] == digest):
+            _copy_pdf(f, t)
+        current[f.name] = {"size": st.st_size, "mtimeNs": st.st_mtime_ns, "sha256": digest}
+
+    for stale in dst.glob("*.pdf"):
+        if stale.name not in current:
+            journal_touch(stale)
+            stale.unlink()
+
+    if current != manifest:
+        PDF_MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(PDF_MANIFEST_FILE, json.dumps(current, indent=1))
+    return [dst / name for name in sorted(current)]
 
 
 def append_publication_cards(pdf_files: list[pathlib.Path]) -> int:
@@ -606,31 +2902,792 @@ def append_publication_cards(pdf_files: list[pathlib.Path]) -> int:
         block = render_card(mtime, "Publication", title, body, link=rel)
         blocks.append((f"pub:{pid}", block))
 
-    return insert_blocks_after_grid_open(pub_file, "grid", blocks)
+    added = insert_blocks_after_grid_open(pub_file, "grid", blocks)
+    roll_over_cards(pub_file, "grid")
+    return added
+
+
+# Static search index. The host only serves files, so site/search/ holds a
+# precomputed inverted index over feed papers and pipeline cards that the
+# browser reads directly:
+#   meta.json        {format, docs, totalLen, prefixLen, docShard, split, delta}
+#   t/<key>.json     {term: [doc, tf, doc, tf, ...]}
+#   delta/<n>.json   the same, for the docs one update added starting at doc n
+#   d/<n>.json       [[title, url, date, tag, snippet, length], ...] for docs
+#                    n*docShard .. (n+1)*docShard-1
+# A term's shard key is its first prefixLen characters, extended one
+# character at a time while the key is in `split` and the term is longer: a
+# shard that outgrows SEARCH_SHARD_MAX_BYTES hands its longer terms to child
+# shards. Terms are tokenize() output; a query fetches meta.json, one shard
+# per distinct key, every delta segment listed in meta.json and the doc
+# shards of its top hits. Doc numbers only grow, so an update writes its
+# postings as one new delta segment plus the last doc shard: bytes in
+# proportion to what it adds. Once there are SEARCH_DELTA_SEGMENTS segments
+# or SEARCH_DELTA_MAX_BYTES of them, an update compacts them into the term
+# shards. Card URLs are relative to site/; a card without a link of its own
+# points at its page and is re-pointed when roll_over_cards() archives it.
+# cache/search.json records how many feed rows are indexed, which cards each
+# front page had last time (new cards only ever land on front pages) and the
+# doc numbers of front-page cards that point at their page.
+SEARCH_FORMAT = "cohera-search/1"
+SEARCH_PAGES = (("index.html", "grid-1"), ("research/index.html", "grid-2"), ("publications/index.html", "grid"))
+_CARD_FIELD_RE = {
+    "date": re.compile(r'<span class="accent-text">(.*?)</span>', re.S),
+    "tag": re.compile(r"<span>\[(.*?)\]</span>", re.S),
+    "title": re.compile(r'<h2 class="card-title">(.*?)</h2>', re.S),
+    "body": re.compile(r'<div class="card-body">(.*?)(?:<p><a |</div>)', re.S),
+    "link": re.compile(r'<a href="([^"]*)"'),
+}
+
+
+def _search_doc(title: str, url: str, date: str, tag: str, body: str) -> tuple[list, list[str]]:
+    import textwrap
+
+    tokens = tokenize(f"{title} {title} {body}")
+    snippet = textwrap.shorten(body, width=SEARCH_SNIPPET_CHARS, placeholder="…") if body else ""
+    return [title, url, date, tag, snippet, len(tokens)], tokens
+
+
+def _search_card_doc(card_html: str, page: str) -> tuple[list, list[str]]:
+    import html
+
+    fields = {}
+    for name, pat in _CARD_FIELD_RE.items():
+        m = pat.search(card_html)
+        fields[name] = html.unescape(strip_html_text(m.group(1))) if m else ""
+    link = fields["link"]
+    if link and not urllib.parse.urlsplit(link).scheme:
+        link = posixpath.normpath(posixpath.join(posixpath.dirname(page), link))
+    return _search_doc(fields["title"], link or page, fields["date"], fields["tag"], fields["body"])
+
+
+def _search_shard_key(term: str, split: set[str]) -> str:
+    n = SEARCH_PREFIX_LEN
+    while len(term) > n and term[:n] in split:
+        n += 1
+    return term[:n]
+
+
+def _search_write_shard(key: str, terms: dict[str, list[int]], split: set[str]) -> None:
+    text = json.dumps(terms, ensure_ascii=False, separators=(",", ":"))
+    if len(text) > SEARCH_SHARD_MAX_BYTES and len(terms) > 1:
+        split.add(key)
+        keep: dict[str, list[int]] = {}
+        children: dict[str, dict[str, list[int]]] = {}
+        for term, plist in terms.items():
+            (keep if len(term) <= len(key) else children.setdefault(term[: len(key) + 1], {}))[term] = plist
+        for child, child_terms in children.items():
+            _search_write_shard(child, child_terms, split)
+        text = json.dumps(keep, ensure_ascii=False, separators=(",", ":"))
+    atomic_write(SEARCH_DIR / "t" / f"{key}.json", text)
+
+
+def _search_read(path: pathlib.Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return default
+
+
+def _search_repoint(moved: dict[int, str]) -> None:
+    """Rewrite the URL of doc n to moved[n] in the doc shards that hold them."""
+    by_shard: dict[int, list[int]] = {}
+    for n in moved:
+        by_shard.setdefault(n // SEARCH_DOC_SHARD, []).append(n)
+    for shard, numbers in sorted(by_shard.items()):
+        path = SEARCH_DIR / "d" / f"{shard}.json"
+        records = _search_read(path, [])
+        for n in numbers:
+            if n - shard * SEARCH_DOC_SHARD < len(records):
+                records[n - shard * SEARCH_DOC_SHARD][1] = moved[n]
+        atomic_write(path, json.dumps(records, ensure_ascii=False, separators=(",", ":")))
+
+
+def update_search_index(store: dict) -> int:
+    """Index feed rows and front-page cards added since the last update; returns documents added."""
+    state = _search_read(SEARCH_STATE_FILE, {})
+    meta = _search_read(SEARCH_DIR / "meta.json", {})
+    rows = store["rows"]
+    rebuild = (
+        meta.get("format") != SEARCH_FORMAT
+        or meta.get("docs") != state.get("docs")
+        or meta.get("prefixLen") != SEARCH_PREFIX_LEN
+        or meta.get("docShard") != SEARCH_DOC_SHARD
+        or state.get("feedRows", 0) > len(rows)
+    )
+    if rebuild:
+        state = {"docs": 0, "totalLen": 0, "feedRows": 0, "cards": {}, "pageDocs": {}}
+
+    docs: list[tuple[list, list[str]]] = []
+    for i in range(state["feedRows"], len(rows), 500):
+        for it in feed_read([row[0] for row in rows[i : i + 500]], full=True):
+            docs.append(
+                _search_doc(it.get("title", ""), it.get("id", ""), it.get("published", "")[:10], "Paper", it.get("summary", ""))
+            )
+    state["feedRows"] = len(rows)
+    moved: dict[int, str] = {}
+    for page, grid in SEARCH_PAGES:
+        front = SITE / page
+        seen = set(state["cards"].get(page, ()))
+        page_docs: dict[str, int] = state["pageDocs"].setdefault(page, {})
+        # A rebuild also picks up everything already rolled into archive pages.
+        archives = archive_pages(front)
+        for path in [front, *archives] if rebuild else [front]:
+            entry = page_entry(path, grid)
+            if not entry:
+                continue
+            rel = path.relative_to(SITE).as_posix()
+            new_cards = [c for c in entry["cards"] if c[2] not in seen]
+            if new_cards:
+                data = path.read_bytes()
+                for start, end, marker in reversed(new_cards):  # oldest first
+                    record, tokens = _search_card_doc(data[start:end].decode("utf-8", "replace"), rel)
+                    if path == front and record[1] == page:
+                        page_docs[marker] = state["docs"] + len(docs)
+                    docs.append((record, tokens))
+            if path == front:
+                state["cards"][page] = [c[2] for c in entry["cards"]]
+        # Cards that left the front page went to the newest archives; follow them there.
+        gone = set(page_docs) - set(state["cards"].get(page, ()))
+        for path in reversed(archives):
+            if not gone:
+                break
+            entry = page_entry(path, grid)
+            for marker in gone & set(entry["markers"] if entry else ()):
+                moved[page_docs.pop(marker)] = path.relative_to(SITE).as_posix()
+                gone.discard(marker)
+        for marker in gone:
+            page_docs.pop(marker)  # removed by hand: nowhere to point
+
+    first = state["docs"]
+    split = set() if rebuild else set(meta.get("split", ()))
+    postings: dict[str, list[int]] = {}
+    for n, (record, tokens) in enumerate(docs, start=first):
+        counts: dict[str, int] = {}
+        for tok in tokens:
+            counts[tok] = counts.get(tok, 0) + 1
+        for tok, tf in counts.items():
+            postings.setdefault(tok, []).extend((n, tf))
+        state["totalLen"] += record[-1]
+    state["docs"] = first + len(docs)
+
+    for sub in ("t", "d", "delta"):
+        (SEARCH_DIR / sub).mkdir(parents=True, exist_ok=True)
+    if rebuild:
+        # Blank out shards left by an older index instead of deleting them, so a rollback restores them.
+        for path in (SEARCH_DIR / "t").glob("*.json"):
+            atomic_write(path, "{}")
+        for path in (SEARCH_DIR / "d").glob("*.json"):
+            if path.stem.isdigit() and int(path.stem) * SEARCH_DOC_SHARD >= state["docs"]:
+                atomic_write(path, "[]")
+    segments = [] if rebuild else list(meta.get("delta", ()))
+    segment_paths = [SEARCH_DIR / "delta" / f"{n}.json" for n in segments]
+    delta_bytes = sum(p.stat().st_size for p in segment_paths if p.exists())
+    new_segment = json.dumps(postings, ensure_ascii=False, separators=(",", ":"))
+    if rebuild or len(segments) >= SEARCH_DELTA_SEGMENTS or delta_bytes + len(new_segment) > SEARCH_DELTA_MAX_BYTES:
+        # Compact: fold every segment and this update into the term shards.
+        merged_terms: dict[str, list[int]] = {}
+        for path in segment_paths:
+            for term, plist in _search_read(path, {}).items():
+                merged_terms.setdefault(term, []).extend(plist)
+        for term, plist in postings.items():
+            merged_terms.setdefault(term, []).extend(plist)
+        shards: dict[str, dict[str, list[int]]] = {}
+        for term, plist in merged_terms.items():
+            shards.setdefault(_search_shard_key(term, split), {})[term] = plist
+        for key, terms in shards.items():
+            merged = {} if rebuild else _search_read(SEARCH_DIR / "t" / f"{key}.json", {})
+            for term, plist in terms.items():
+                merged.setdefault(term, []).extend(plist)
+            _search_write_shard(key, merged, split)
+        for path in (SEARCH_DIR / "delta").glob("*.json"):
+            journal_touch(path)
+            path.unlink()
+        segments = []
+    elif docs:
+        atomic_write(SEARCH_DIR / "delta" / f"{first}.json", new_segment)
+        segments.append(first)
+    for shard in range(first // SEARCH_DOC_SHARD, (state["docs"] - 1) // SEARCH_DOC_SHARD + 1) if docs else ():
+        lo = shard * SEARCH_DOC_SHARD
+        path = SEARCH_DIR / "d" / f"{shard}.json"
+        records = _search_read(path, [])[: first - lo] if lo < first else []
+        records += [r for r, _ in docs[max(lo - first, 0) : lo + SEARCH_DOC_SHARD - first]]
+        atomic_write(path, json.dumps(records, ensure_ascii=False, separators=(",", ":")))
+    if moved:
+        _search_repoint(moved)
+
+    if docs or rebuild:
+        meta = {
+            "format": SEARCH_FORMAT,
+            "docs": state["docs"],
+            "totalLen": state["totalLen"],
+            "prefixLen": SEARCH_PREFIX_LEN,
+            "docShard": SEARCH_DOC_SHARD,
+            "split": sorted(split),
+            "delta": segments,
+        }
+        atomic_write(SEARCH_DIR / "meta.json", json.dumps(meta, separators=(",", ":")))
+    atomic_write(SEARCH_STATE_FILE, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+    return len(docs)
+
+
+def run_backfill(topic: str, since: str = "", start: int = 0, max_items: int | None = None) -> int:
+    """
+    Seed the feed store with a topic's history; items are flushed to the log
+    page by page while the next page is already being fetched (one page of
+    read-ahead, so memory stays bounded however deep it goes). Each page is
+    screened and appended under the run lock against the store as it is then,
+    so cron runs and daemon flushes can interleave with a long backfill.
+    """
+    ensure_dirs()
+    store = open_feed_store()
+    run_ts = now_lima().isoformat()
+    batch: list[dict] = []
+    added = 0
+
+    def flush() -> None:
+        nonlocal store, added
+        with run_lock():
+            stale = journal_load()
+            if stale:
+                # Roll back a dead run first: its rollback would truncate our appends.
+                journal_rollback(stale)
+                journal_commit()
+            store = open_feed_store()
+            dedup = open_dedup_index(store)
+            fresh: list[dict] = []
+            for x in reversed(batch):  # pages come newest-first; the log is oldest-first
+                if feed_has(store, x["id"]) or dedup_match(dedup, x) is not None:
+                    count_metric("dedupSkipped")
+                    continue
+                dedup_add(dedup, [x])
+                fresh.append(x)
+            feed_append(store, fresh)
+            save_dedup_index(dedup)
+        added += len(fresh)
+        batch.clear()
+
+    pages = backfill_arxiv_topic(topic, since=since, known=lambda pid: feed_has(store, pid), start=start)
+    for item in buffered(pages, BACKFILL_PAGE_SIZE, name="backfill"):
+        x = as_item(item)
+        x["addedAt"] = run_ts
+        x["kind"] = "paper"
+        x["status"] = "backfilled"
+        batch.append(x)
+        if len(batch) >= BACKFILL_PAGE_SIZE:
+            flush()
+        if max_items is not None and added + len(batch) >= max_items:
+            break
+    if batch:
+        flush()
+    return added
 
 
-def main() -> None:
-    ensure_dirs()
+def run_replay(scratch: pathlib.Path, since: str = "", until: str = "", keep_state: bool = False) -> dict:
+    """
+    Replay stored source snapshots, oldest first, through ingest, thread and
+    news choice and card rendering inside `scratch` (a new directory holding
+    copies of site/ and research/pipeline/). Runs offline on a clock set to
+    each snapshot's time. Pipeline state starts empty apart from the thread
+    registry unless `keep_state`. Returns the report also written to
+    scratch/replay.json: per snapshot the counts and the news/research picks,
+    ready to diff between two scoring variants.
+    """
+    global _CLOCK
+    source_root = ROOT
+    snapshots = [
+        p
+        for p in sorted(SOURCES_DIR.glob("*.json"))
+        if (not since or p.stem >= since) and (not until or p.stem < until)
+    ]
+    scratch = pathlib.Path(scratch).resolve()
+    if scratch.exists() and any(scratch.iterdir()):
+        raise SystemExit(f"replay scratch directory is not empty: {scratch}")
+    shutil.copytree(SITE, scratch / "site", ignore=shutil.ignore_patterns("*.pdf"))
+    if keep_state:
+        shutil.copytree(STATE_DIR, scratch / "research" / "pipeline", ignore=shutil.ignore_patterns("cache"))
+    else:
+        (scratch / "research" / "pipeline").mkdir(parents=True)
+        if THREAD_REGISTRY_FILE.exists():
+            shutil.copy2(THREAD_REGISTRY_FILE, scratch / "research" / "pipeline" / THREAD_REGISTRY_FILE.name)
+    if SOURCE_OBJECTS_DIR.exists():
+        # Objects are read in place; replay never writes snapshots.
+        objects = scratch / SOURCE_OBJECTS_DIR.relative_to(source_root)
+        objects.parent.mkdir(parents=True, exist_ok=True)
+        objects.symlink_to(SOURCE_OBJECTS_DIR.resolve(), target_is_directory=True)
+
+    clock = [now_lima()]
+    steps: list[dict] = []
+    t0 = time.perf_counter()
+    set_root(scratch)
+    _CLOCK = lambda: clock[0]
+    try:
+        ensure_dirs()
+        store = open_feed_store()
+        index = open_bm25_index(store)
+        dedup = open_dedup_index(store)
+        objects_seen: dict[str, Item] = {}
+        for snap in snapshots:
+            clock[0] = snapshot_time(snap)
+            reset_run_metrics()
+            discovered = list(iter_sources_snapshot(snap, objects_seen))
+            st = load_thread_state()
+            new_items = integrate_new_items(discovered, store, index, dedup, st)
+            save_thread_state(st)
+            digest_file = DIGESTS_DIR / f"{clock[0]:%Y-%m-%d}-arxiv-digest.md"
+            home, research = append_home_and_research(new_items, discovered, digest_file, ROOT / snap.relative_to(source_root))
+            steps.append(
+                {
+                    "snapshot": snap.name,
+                    "at": clock[0].isoformat(),
+                    "discovered": len(discovered),
+                    "new": len(new_items),
+                    "homeAdded": home,
+                    "researchAdded": research,
+                    **_RUN_METRICS["picks"],
+                }
+            )
+        save_bm25_index(index)
+        save_dedup_index(dedup)
+    finally:
+        _CLOCK = None
+        set_root(source_root)
+
+    report = {
+        "snapshots": len(steps),
+        "new": sum(s["new"] for s in steps),
+        "wallS": round(time.perf_counter() - t0, 4),
+        "steps": steps,
+    }
+    (scratch / "replay.json").write_text(json.dumps(report, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    return report
+
+
+# Stage hand-off: every stage reads its inputs from persisted state, so each
+# can run as its own short process (python3 -m scripts.recursive_research_pipeline
+# STAGE) and cron can run cheap local stages often and discovery rarely.
+# stages.json names the latest snapshot and how far it has got: discover
+# adds its snapshot to "pending", ingest admits every pending snapshot and
+# records the ids it admitted, digest the digest file, render marks the
+# snapshot rendered. Each stage clears the marks of the stages after it, and
+# a stage whose input has not moved since it last ran has nothing to do.
+# Paths are relative to ROOT.
+STAGE_COMMANDS = {
+    "discover": ["discover"],
+    "ingest": ["ingest"],
+    "digest": ["digest"],
+    "render": ["render", "search"],
+    "sync-pdfs": ["publications", "search"],
+    "all": ["discover", "ingest", "digest", "render", "publications", "search"],
+}
+
+
+def load_stage_state() -> dict:
+    try:
+        return json.loads(STAGE_STATE_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def save_stage_state(state: dict) -> None:
+    atomic_write(STAGE_STATE_FILE, json.dumps(state, ensure_ascii=False, indent=1) + "\n")
 
-    discovered = discover_arxiv()
-    source_file = write_sources_snapshot(discovered)
 
-    state = load_state()
-    new_items, state = integrate_new_items(discovered, state)
-    save_state(state)
+def _root_rel(path: pathlib.Path) -> str:
+    return pathlib.Path(path).relative_to(ROOT).as_posix()
 
-    digest_file = write_digest(new_items, source_file)
+
+def _stage_idle(state: dict, needs: str, marks: str) -> str | None:
+    """Why a stage has nothing to do: its input is not ready, or it already ran on the latest snapshot."""
+    snapshot = state.get("snapshot")
+    if not snapshot:
+        return "no snapshot yet; run discover first"
+    if state.get(needs) != snapshot:
+        return f"{snapshot} is not {needs} yet"
+    if state.get(marks) == snapshot:
+        return f"{snapshot} already {marks}"
+    return None
+
+
+_STAGE_MARKS = ("ingested", "digested", "rendered")
+
+
+def _stage_marked(state: dict, **marks) -> dict:
+    """`state` with `marks` set and the marks of every later stage cleared."""
+    last = max((_STAGE_MARKS.index(k) for k in marks if k in _STAGE_MARKS), default=-1)
+    cleared = _STAGE_MARKS[last + 1 :]
+    return {**{k: v for k, v in state.items() if k not in cleared}, **marks}
+
+
+def _ctx_discovered(ctx: dict, state: dict) -> list[dict]:
+    if "discovered" not in ctx:
+        ctx["discovered"] = list(iter_sources_snapshot(ROOT / state["snapshot"]))
+    return ctx["discovered"]
+
+
+def _pending_discovered(ctx: dict, state: dict) -> list[dict]:
+    """Items of every snapshot discovered since the last ingest, collated if there is more than one."""
+    pending = state.get("pending", [])
+    if pending == [state["snapshot"]]:
+        return _ctx_discovered(ctx, state)
+    items: list[dict] = []
+    for rel in pending:
+        items.extend(_ctx_discovered(ctx, state) if rel == state["snapshot"] else iter_sources_snapshot(ROOT / rel))
+    return collate_discovered(items)
+
+
+def _ctx_new_items(ctx: dict, state: dict) -> list[dict]:
+    if "newItems" not in ctx:
+        store = ctx.get("store") or open_feed_store()
+        rows = [store["ids"][pid] for pid in state.get("newItems", []) if pid in store["ids"]]
+        ctx["newItems"] = feed_read([row[0] for row in rows])
+    return ctx["newItems"]
+
+
+def stage_discover(ctx: dict, m: dict) -> dict:
+    # Feed and dedup index are opened before discovery so batches are screened as they arrive.
+    report: dict = {}
+    ctx["store"] = open_feed_store()
+    ctx["dedup"] = open_dedup_index(ctx["store"])
+    batches = iter_discovery(report=report)
+    discovered = collate_discovered(screen_stream(batches, ctx["store"], ctx["dedup"], ctx.setdefault("screened", {})))
+    source_file = write_sources_snapshot(discovered)
+    rel = _root_rel(source_file)
+    state = load_stage_state()
+    pending = [p for p in state.get("pending", []) if p != rel] + [rel]
+    save_stage_state(_stage_marked(state, snapshot=rel, pending=pending))
+    ctx["discovered"] = discovered
+    m.update(itemsIn=len(TOPICS), itemsOut=len(discovered), failed=len(report["failed"]), timedOut=len(report["timedOut"]))
+    return {"sourceFile": str(source_file), "count": len(discovered), "report": report}
+
+
+def stage_ingest(ctx: dict, m: dict) -> dict:
+    state = load_stage_state()
+    if not state.get("pending"):
+        return {"skipped": "no new snapshot; run discover first" if not state.get("snapshot") else f"{state['snapshot']} already ingested"}
+    discovered = _pending_discovered(ctx, state)
+    store = ctx.get("store") or open_feed_store()
+    index = open_bm25_index(store)
+    dedup = ctx.get("dedup") or open_dedup_index(store)
+    st = load_thread_state()
+    new_items = integrate_new_items(discovered, store, index, dedup, st, ctx.get("screened"))
+    save_bm25_index(index)
+    save_dedup_index(dedup)
+    save_thread_state(st)
+    save_stage_state(_stage_marked(state, pending=[], ingested=state["snapshot"], newItems=[it["id"] for it in new_items]))
+    ctx.update(store=store, newItems=new_items)
+    m.update(itemsIn=len(discovered), itemsOut=len(new_items), feedSize=len(store["rows"]))
+    return {"new": len(new_items)}
+
+
+def stage_digest(ctx: dict, m: dict) -> dict:
+    state = load_stage_state()
+    idle = _stage_idle(state, "ingested", "digested")
+    if idle:
+        return {"skipped": idle}
+    new_items = _ctx_new_items(ctx, state)
+    m.update(itemsIn=len(new_items))
+    digest_file = write_digest(new_items, ROOT / state["snapshot"])
     write_synthesis_brief(new_items)
+    save_stage_state(_stage_marked(state, digested=state["snapshot"], digest=_root_rel(digest_file)))
+    return {"digestFile": str(digest_file)}
+
 
-    feed_items = state.get("items", [])
-    home_added, research_added = append_home_and_research(new_items, feed_items, discovered, digest_file, source_file)
+def stage_render(ctx: dict, m: dict) -> dict:
+    state = load_stage_state()
+    idle = _stage_idle(state, "digested", "rendered")
+    if idle:
+        return {"skipped": idle}
+    new_items = _ctx_new_items(ctx, state)
+    discovered = _ctx_discovered(ctx, state)
+    home_added, research_added = append_home_and_research(new_items, discovered, ROOT / state["digest"], ROOT / state["snapshot"])
+    save_stage_state(_stage_marked(state, rendered=state["snapshot"]))
+    m.update(itemsIn=len(new_items), itemsOut=home_added + research_added)
+    return {"homeAdded": home_added, "researchAdded": research_added}
 
+
+def stage_publications(ctx: dict, m: dict) -> dict:
     synced_pdfs = sync_publication_pdfs()
     pub_added = append_publication_cards(synced_pdfs)
+    m.update(itemsIn=len(synced_pdfs), itemsOut=pub_added)
+    return {"pubAdded": pub_added}
+
+
+def stage_search(ctx: dict, m: dict) -> dict:
+    store = ctx.get("store") or open_feed_store()
+    added = update_search_index(store)
+    m.update(itemsIn=len(store["rows"]), itemsOut=added)
+    return {"searchAdded": added}
+
+
+PIPELINE_STAGES: dict[str, Callable[[dict, dict], dict]] = {
+    "discover": stage_discover,
+    "ingest": stage_ingest,
+    "digest": stage_digest,
+    "render": stage_render,
+    "publications": stage_publications,
+    "search": stage_search,
+}
+
+
+def run_stages(names: list[str], ctx: dict) -> dict[str, dict]:
+    """Run pipeline stages in order under run_stage(), sharing `ctx` (open stores, items in memory)."""
+    results: dict[str, dict] = {}
+    for name in names:
+        fn = PIPELINE_STAGES[name]
+        results[name] = run_stage(name, lambda m: fn(ctx, m))
+    return results
+
+
+def _add_run_flags(p: argparse.ArgumentParser, suppress: bool = False) -> None:
+    # Accepted before or after the stage name; SUPPRESS keeps a subparser from resetting the top-level value.
+    default = argparse.SUPPRESS if suppress else None
+    p.add_argument("--resume", action="store_true", default=default, help="continue an interrupted run from its last completed stage")
+    p.add_argument(
+        "--profile",
+        default=default,
+        help="comma list of cprofile,tracemalloc to capture under research/pipeline/cache/profiles (default: $COHERA_PROFILE)",
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Cohera recursive research pipeline")
+    ap.add_argument("--root", default=None, help="repo checkout to work on (default: $COHERA_ROOT, else this script's checkout)")
+    ap.add_argument("--backfill", metavar="TOPIC", help="page through TOPIC's history into the feed store and exit")
+    ap.add_argument("--since", default="", help="backfill cutoff / first replayed date (YYYY-MM-DD)")
+    ap.add_argument("--start", type=int, default=0, help="backfill result offset to resume from")
+    ap.add_argument("--max-items", type=int, default=None, help="stop backfill after this many items")
+    ap.add_argument("--replay", metavar="SCRATCH", help="replay stored snapshots offline into a new scratch directory and exit")
+    ap.add_argument("--until", default="", help="replay snapshots taken before this date (YYYY-MM-DD)")
+    ap.add_argument("--keep-state", action="store_true", help="replay on top of a copy of the current pipeline state")
+    ap.add_argument("--daemon", action="store_true", help="run as a resident scheduler with per-topic polling intervals")
+    _add_run_flags(ap)
+    sub = ap.add_subparsers(dest="command", metavar="STAGE", help="run one stage on persisted state (default: all)")
+    for name, summary in (
+        ("discover", "query arXiv and write a source snapshot"),
+        ("ingest", "admit the latest snapshot's new papers into the feed store"),
+        ("digest", "write the digest and synthesis brief for the last ingest"),
+        ("render", "append home/research cards for the last digest, then update the search index"),
+        ("sync-pdfs", "sync publication PDFs and cards, then update the search index"),
+        ("all", "every stage in one run"),
+    ):
+        _add_run_flags(sub.add_parser(name, help=summary, description=summary), suppress=True)
+    args = ap.parse_args(argv)
+    args.resume = bool(args.resume)
+    return args
+
+
+def publish(discovered: list[dict], new_items: list[dict]) -> dict:
+    """Snapshot, digest, cards and publications for one daemon flush."""
+    ctx = {"discovered": discovered, "newItems": new_items}
+
+    def snapshot(m: dict) -> dict:
+        m.update(itemsIn=len(discovered))
+        source_file = write_sources_snapshot(discovered)
+        rel = _root_rel(source_file)
+        # Ingested as it arrived, so the hand-off starts at digest.
+        save_stage_state(_stage_marked(load_stage_state(), snapshot=rel, ingested=rel, newItems=[it["id"] for it in new_items]))
+        return {"sourceFile": str(source_file)}
+
+    out = dict(run_stage("snapshot", snapshot))
+    for result in run_stages(["digest", "render", "publications", "search"], ctx).values():
+        out.update(result)
+    return out
+
+
+def _topic_interval(topic: str) -> float:
+    return TOPIC_INTERVALS_S.get(topic, DAEMON_TOPIC_INTERVAL_S)
+
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1.0 - DAEMON_JITTER, 1.0 + DAEMON_JITTER)
 
-    print(f"Pipeline complete. discovered={len(discovered)} new={len(new_items)}")
-    print(f"Digest: {digest_file}")
-    print(f"Added cards -> home:{home_added} research:{research_added} publications:{pub_added}")
+
+def run_daemon(max_cycles: int | None = None) -> None:
+    """
+    Resident scheduler. The feed store, evidence index, relevance masks and
+    keep-alive connections stay warm between cycles. Each topic is polled on
+    its own jittered interval, which halves when a poll admits new papers and
+    grows by half when it does not (within DAEMON_MIN/MAX_INTERVAL_S), so hot
+    topics are checked often and cold ones rarely. New items are appended to
+    the feed log as they are admitted; snapshot, digest, cards, indexes and
+    metrics are written in one flush every DAEMON_FLUSH_S.
+    """
+    import concurrent.futures
+
+    ensure_dirs()
+    with run_lock():
+        stale = journal_load()
+        if stale:
+            journal_rollback(stale)
+            journal_commit()
+    store = open_feed_store()
+    index = open_bm25_index(store)
+    dedup = open_dedup_index(store)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, DISCOVERY_WORKERS), thread_name_prefix="arxiv")
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    start = time.monotonic()
+    # Stagger first polls so a restart does not burst every topic at once.
+    schedule = {t: {"interval": _topic_interval(t), "due": start + i * ARXIV_POLITE_DELAY_S} for i, t in enumerate(TOPICS)}
+    pending_discovered: dict[str, dict] = {}
+    pending_new: list[dict] = []
+    next_flush = start + DAEMON_FLUSH_S
+    cycles = 0
+    metrics = reset_run_metrics()
+    flush_t0 = time.perf_counter()
+
+    def flush() -> None:
+        nonlocal pending_discovered, pending_new, metrics, flush_t0
+        discovered = sorted(pending_discovered.values(), key=lambda x: x.get("published", ""), reverse=True)
+        with run_lock():
+            journal_begin(now_lima().strftime("%Y%m%d-%H%M%S"))
+            out = publish(discovered, pending_new)
+            run_stage("index", lambda m: save_bm25_index(index) or save_dedup_index(dedup) or {})
+            journal_commit()
+        http_cache_flush()
+        metrics.update(wallS=round(time.perf_counter() - flush_t0, 4), discovered=len(discovered), new=len(pending_new), mode="daemon")
+        write_metrics(metrics)
+        print(
+            f"[{now_lima().isoformat(timespec='seconds')}] flush discovered={len(discovered)} new={len(pending_new)} "
+            f"cards home:{out['homeAdded']} research:{out['researchAdded']} publications:{out['pubAdded']}",
+            flush=True,
+        )
+        pending_discovered, pending_new = {}, []
+        metrics = reset_run_metrics()
+        flush_t0 = time.perf_counter()
+
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            due = [t for t, s in schedule.items() if s["due"] <= now]
+            if due:
+                with stage(f"cycle-{cycles}") as m:
+                    report: dict = {}
+                    screened: dict = {}
+                    batches = iter_discovery(due, pool=pool, report=report)
+                    discovered = collate_discovered(screen_stream(batches, store, dedup, screened))
+                    st = load_thread_state()
+                    new_items = integrate_new_items(discovered, store, index, dedup, st, screened)
+                    if new_items:
+                        save_thread_state(st)
+                    m.update(itemsIn=len(due), itemsOut=len(new_items))
+                fresh: dict[str, int] = {}
+                for it in new_items:
+                    for t in it.get("topics") or [it.get("topic", "")]:
+                        fresh[t] = fresh.get(t, 0) + 1
+                for t in due:
+                    s = schedule[t]
+                    if t in report["ok"]:
+                        factor = 0.5 if fresh.get(t) else 1.5
+                        s["interval"] = min(DAEMON_MAX_INTERVAL_S, max(DAEMON_MIN_INTERVAL_S, s["interval"] * factor))
+                        s["due"] = time.monotonic() + _jittered(s["interval"])
+                    else:
+                        s["due"] = time.monotonic() + _jittered(DAEMON_MIN_INTERVAL_S)
+                for it in discovered:
+                    # Held until the next flush: keep only the slots in memory.
+                    it.spill(("object", store_source_object(it)))
+                    pending_discovered[canonical_paper_id(it["id"])] = it
+                pending_new = new_items + pending_new
+                cycles += 1
+            if pending_discovered and time.monotonic() >= next_flush:
+                flush()
+                next_flush = time.monotonic() + DAEMON_FLUSH_S
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            wake = min([s["due"] for s in schedule.values()] + [next_flush])
+            stop.wait(max(0.0, wake - time.monotonic()))
+    finally:
+        if pending_discovered:
+            flush()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.root:
+        set_root(pathlib.Path(args.root))
+    if args.backfill:
+        added = run_backfill(args.backfill, since=args.since, start=args.start, max_items=args.max_items)
+        print(f"Backfill complete. topic={args.backfill!r} added={added}")
+        return
+    if args.daemon:
+        run_daemon()
+        return
+    if args.replay:
+        report = run_replay(pathlib.Path(args.replay), since=args.since, until=args.until, keep_state=args.keep_state)
+        print(f"Replay complete. snapshots={report['snapshots']} new={report['new']} wall={report['wallS']:.2f}s -> {args.replay}")
+        return
+    command = args.command or "all"
+
+    ensure_dirs()
+    with run_lock():
+        journal = journal_load()
+        if journal and not args.resume:
+            journal_rollback(journal)
+            journal_commit()
+            journal = None
+            print("Rolled back an interrupted run (pass --resume to continue it instead).")
+        if journal and journal.get("command", "all") != command:
+            print(f"Interrupted run was `{journal.get('command', 'all')}`, not `{command}`; rolling it back instead of resuming.")
+            journal_rollback(journal)
+            journal_commit()
+            journal = None
+        if journal:
+            journal = journal_resume(journal)
+            print(f"Resuming run {journal['runStamp']}; completed stages: {', '.join(journal['done']) or '-'}")
+        else:
+            journal = journal_begin(now_lima().strftime("%Y%m%d-%H%M%S"), command)
+        run_stamp = journal["runStamp"]
+
+        metrics = reset_run_metrics()
+        profile_modes = [m.strip() for m in (args.profile or os.environ.get("COHERA_PROFILE", "")).split(",") if m.strip()]
+        run_t0 = time.perf_counter()
+
+        with profiling(profile_modes) as captured:
+            results = run_stages(STAGE_COMMANDS[command], {"screened": {}})
+
+        journal_commit()
+
+    profile_name = pathlib.Path(results.get("digest", {}).get("digestFile") or command).stem
+    metrics.update(wallS=round(time.perf_counter() - run_t0, 4), command=command)
+    if "discover" in results:
+        metrics["discovered"] = results["discover"]["count"]
+    if "new" in results.get("ingest", {}):
+        metrics["new"] = results["ingest"]["new"]
+    metrics["profiles"] = [str(p.relative_to(ROOT)) for p in write_profiles(captured, profile_name, run_stamp)]
+    write_metrics(metrics)
+
+    if command == "all":
+        discovery, out = results["discover"]["report"], {k: v for r in results.values() for k, v in r.items()}
+        print(f"Pipeline complete. discovered={metrics['discovered']} new={metrics.get('new', 0)} wall={metrics['wallS']:.2f}s")
+        if discovery["failed"] or discovery["timedOut"]:
+            failed = "; ".join(f"{t} ({err})" for t, err in discovery["failed"].items()) or "-"
+            print(f"Discovery incomplete. failed: {failed} | timed out: {', '.join(discovery['timedOut']) or '-'}")
+        print(f"Digest: {out['digestFile']}")
+        print(f"Added cards -> home:{out['homeAdded']} research:{out['researchAdded']} publications:{out['pubAdded']}")
+        print(f"Search index: +{out['searchAdded']} documents")
+        return
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name}: nothing to do ({result['skipped']})")
+        elif name == "discover":
+            print(f"Discovered {result['count']} papers -> {_root_rel(pathlib.Path(result['sourceFile']))}")
+            if result["report"]["failed"] or result["report"]["timedOut"]:
+                print(f"Discovery incomplete. failed: {len(result['report']['failed'])} timed out: {len(result['report']['timedOut'])}")
+        elif name == "ingest":
+            print(f"Ingested {result['new']} new papers")
+        elif name == "digest":
+            print(f"Digest: {result['digestFile']}")
+        elif name == "render":
+            print(f"Added cards -> home:{result['homeAdded']} research:{result['researchAdded']}")
+        elif name == "publications":
+            print(f"Added cards -> publications:{result['pubAdded']}")
+        elif name == "search":
+            print(f"Search index: +{result['searchAdded']} documents")
+    print(f"{command} complete. wall={metrics['wallS']:.2f}s")
 
 
 if __name__ == "__main__":